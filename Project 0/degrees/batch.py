@@ -0,0 +1,150 @@
+"""
+Answers many degrees-of-separation queries against one loaded graph.
+
+Each input line is a JSON object such as
+    {"source": "Tom Hanks", "target": "102"}
+where source and target are a person's name or IMDB id. One JSON result
+line is written per query as soon as it finishes, so output order may
+differ from input order; the "line" field gives the input line number.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import degrees
+
+
+def resolve(person):
+    """
+    Returns the person_id for an IMDB id or an unambiguous name.
+    Raises ValueError if there is no such person or the name is ambiguous.
+    """
+    person = str(person)
+    if person in degrees.people:
+        return person
+    person_ids = degrees.names.get(person.lower(), set())
+    if len(person_ids) == 0:
+        raise ValueError(f"person not found: {person}")
+    if len(person_ids) > 1:
+        raise ValueError(
+            f"ambiguous name: {person} ({', '.join(sorted(person_ids))})"
+        )
+    return next(iter(person_ids))
+
+
+def answer(query):
+    """
+    Answers one (line number, JSON query) pair and returns the result.
+    """
+    number, line = query
+    start = time.perf_counter()
+    result = {"line": number}
+    try:
+        query = json.loads(line)
+        source = resolve(query["source"])
+        target = resolve(query["target"])
+        path = degrees.shortest_path(source, target)
+        result["source"] = source
+        result["target"] = target
+        if path is None:
+            result["degrees"] = None
+            result["path"] = None
+        else:
+            result["degrees"] = len(path)
+            result["path"] = [list(step) for step in path]
+    except (KeyError, TypeError, ValueError) as e:
+        result["error"] = str(e)
+    result["latency_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def read_queries(lines):
+    """
+    Yields (line number, line) pairs, skipping blank lines.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def percentile(values, fraction):
+    """
+    Returns the value at the given fraction of a sorted list.
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Answer degrees-of-separation queries in bulk."
+    )
+    parser.add_argument("directory", help="dataset directory")
+    parser.add_argument("queries", nargs="?",
+                        help="JSONL file of queries (default: stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--compact", action="store_true",
+                        help="load the data as a compact graph")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="memory-map the graph from a snapshot")
+    args = parser.parse_args()
+
+    # Load the graph once; forked workers share it copy-on-write
+    start = time.perf_counter()
+    degrees.load_data(args.directory, compact=args.compact,
+                      snapshot=args.snapshot)
+    print(f"Data loaded in {time.perf_counter() - start:.2f}s.",
+          file=sys.stderr)
+
+    if args.queries:
+        source = open(args.queries, encoding="utf-8")
+    else:
+        source = sys.stdin
+    queries = read_queries(source)
+
+    latencies = []
+    start = time.perf_counter()
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        context = None
+
+    if context is None or args.workers <= 1:
+        results = map(answer, queries)
+        pool = None
+    else:
+        pool = context.Pool(args.workers)
+        results = pool.imap_unordered(answer, queries, chunksize=4)
+
+    try:
+        for result in results:
+            latencies.append(result["latency_ms"])
+            print(json.dumps(result), flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if source is not sys.stdin:
+            source.close()
+
+    # Report latency percentiles and throughput
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    print(f"{len(latencies)} queries in {elapsed:.2f}s "
+          f"({throughput:.1f} queries/s), latency ms "
+          f"p50 {percentile(latencies, 0.50):.2f} "
+          f"p95 {percentile(latencies, 0.95):.2f} "
+          f"p99 {percentile(latencies, 0.99):.2f} "
+          f"max {percentile(latencies, 1.0):.2f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmarks loading and searching a degrees dataset.
+
+Reports load time, peak resident memory, and for a fixed, seeded set of
+random person pairs the search statistics per query (nodes expanded and
+created, frontier peak, neighbor time) and query latency percentiles.
+With --landmarks, searches use the landmark index, and the share of
+connected pairs whose landmark bounds meet, so no search is needed, is
+reported.
+Run each mode in its own process so memory is comparable.
+
+Usage: python benchmark.py directory [--mode dict|compact|snapshot]
+                           [--queries N] [--seed S] [--one-sided]
+                           [--landmarks]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import degrees
+from batch import percentile
+from util import SearchStats
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_memory_mb():
+    """
+    Returns the peak resident set size of this process in megabytes,
+    or None where the resource module is unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees.")
+    parser.add_argument("directory", help="dataset directory")
+    parser.add_argument("--mode", choices=["dict", "compact", "snapshot"],
+                        default="dict", help="how to load the data")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--one-sided", action="store_true",
+                        help="use the one-sided breadth-first search")
+    parser.add_argument("--landmarks", action="store_true",
+                        help="use the landmark index (compact or snapshot)")
+    args = parser.parse_args()
+    if args.queries < 1:
+        parser.error("--queries must be at least 1")
+    if args.landmarks and (args.mode == "dict" or args.one_sided):
+        parser.error("--landmarks needs --mode compact or snapshot")
+
+    start = time.perf_counter()
+    degrees.load_data(args.directory, compact=args.mode == "compact",
+                      snapshot=args.mode == "snapshot")
+    if args.landmarks:
+        degrees.load_landmarks(args.directory)
+    load_time = time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    person_ids = sorted(degrees.people)
+    pairs = [(rng.choice(person_ids), rng.choice(person_ids))
+             for _ in range(args.queries)]
+
+    latencies = []
+    expansions = []
+    created = []
+    peaks = []
+    neighbor_time = 0.0
+    connected = 0
+    for source, target in pairs:
+        stats = SearchStats()
+        start = time.perf_counter()
+        path = degrees.shortest_path(source, target,
+                                     bidirectional=not args.one_sided,
+                                     stats=stats)
+        latencies.append((time.perf_counter() - start) * 1000)
+        expansions.append(stats.states_expanded)
+        created.append(stats.nodes_created)
+        peaks.append(stats.frontier_peak)
+        neighbor_time += stats.neighbor_time
+        if path is not None:
+            connected += 1
+
+    latencies.sort()
+    expansions.sort()
+    created.sort()
+    peaks.sort()
+    memory = peak_memory_mb()
+    print(f"mode:            {args.mode}")
+    print(f"people:          {len(person_ids)}")
+    print(f"load time:       {load_time:.2f}s")
+    if memory is not None:
+        print(f"peak memory:     {memory:.1f} MB")
+    print(f"queries:         {len(pairs)} ({connected} connected)")
+    if args.landmarks:
+        tight, bounded = tight_bounds(pairs)
+        print(f"tight bounds:    {tight} of {bounded} connected pairs")
+    print(f"nodes expanded:  mean {sum(expansions) / len(expansions):.1f}, "
+          f"p50 {percentile(expansions, 0.50)}, "
+          f"max {percentile(expansions, 1.0)}")
+    print(f"nodes created:   mean {sum(created) / len(created):.1f}, "
+          f"p50 {percentile(created, 0.50)}, "
+          f"max {percentile(created, 1.0)}")
+    print(f"frontier peak:   p50 {percentile(peaks, 0.50)}, "
+          f"max {percentile(peaks, 1.0)}")
+    print(f"neighbor time:   {neighbor_time * 1000:.1f} ms total")
+    print(f"latency ms:      p50 {percentile(latencies, 0.50):.3f}, "
+          f"p90 {percentile(latencies, 0.90):.3f}, "
+          f"p99 {percentile(latencies, 0.99):.3f}, "
+          f"max {percentile(latencies, 1.0):.3f}")
+
+
+def tight_bounds(pairs):
+    """
+    Returns (tight, bounded): how many pairs of different people have
+    landmark bounds that meet, and how many a landmark connects.
+    """
+    graph = degrees.graph
+    tight = bounded = 0
+    for source, target in pairs:
+        if source == target:
+            continue
+        bounds = degrees.landmarks.bounds(graph.person_index(source),
+                                          graph.person_index(target))
+        if bounds is None or bounds[1] is None:
+            continue
+        bounded += 1
+        if bounds[0] == bounds[1]:
+            tight += 1
+    return tight, bounded
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import csv
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+import landmarks as landmark_index
+from graph import StarGraph
+from nameindex import NameIndex
+from util import Node, StackFrontier, QueueFrontier, SearchStats
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +15,37 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Compact integer-indexed graph, set when loading with compact=True
+graph = None
 
-def load_data(directory):
+# Landmark distance index over graph, set by load_landmarks
+landmarks = None
+
+# Prefix and fuzzy index over the keys of names, built the first time
+# suggest_name needs it
+name_index = None
+
+
+def load_data(directory, compact=False, snapshot=False):
     """
     Load data from CSV files into memory.
+
+    With compact=True the data is stored in a StarGraph instead, and
+    names, people and movies become read-only views over it.
+
+    With snapshot=True the StarGraph is memory-mapped from a binary
+    snapshot in the directory, which is written on the first load and
+    rebuilt whenever the CSV files change.
     """
+    global name_index
+    name_index = None
+    if snapshot:
+        load_graph(StarGraph.load(directory))
+        return
+    if compact:
+        load_graph(StarGraph.from_csv(directory))
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -52,14 +81,44 @@ def load_data(directory):
                 pass
 
 
+def load_graph(star_graph):
+    """
+    Makes a StarGraph the data source for every lookup in this module.
+    """
+    global graph, names, people, movies
+    graph = star_graph
+    names = graph.names_view()
+    people = graph.people_view()
+    movies = graph.movies_view()
+
+
+def load_landmarks(directory):
+    """
+    Loads the landmark distance index for the compact graph, building and
+    saving it first if needed. Requires data loaded with compact=True.
+    """
+    global landmarks
+    if graph is None:
+        raise Exception("landmarks require a compact graph")
+    landmarks = landmark_index.load_or_build(graph, directory)
+
+
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if (len(args) > 1
+            or not set(flags) <= {"--compact", "--snapshot", "--landmarks",
+                                  "--stats"}):
+        sys.exit("Usage: python degrees.py [--compact] [--snapshot] "
+                 "[--landmarks] [--stats] [directory]")
+    directory = args[0] if len(args) == 1 else "large"
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    compact = "--compact" in flags or "--landmarks" in flags
+    load_data(directory, compact=compact, snapshot="--snapshot" in flags)
+    if "--landmarks" in flags:
+        load_landmarks(directory)
     print("Data loaded.")
 
     source = person_id_for_name(input("Name: "))
@@ -69,7 +128,10 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    stats = SearchStats() if "--stats" in flags else None
+    path = shortest_path(source, target, stats=stats)
+    if stats is not None:
+        print(stats)
 
     if path is None:
         print("Not connected.")
@@ -84,21 +146,63 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=True, stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    By default the search grows frontiers from both ends and stops when
+    they meet; pass bidirectional=False for the one-sided search. Pass a
+    util.SearchStats as stats to have the search's work counted into it.
     """
+    if graph is not None and bidirectional:
+        source_index = graph.person_index(source)
+        target_index = graph.person_index(target)
+        if landmarks is not None:
+            path = landmarks.shortest_path(
+                graph, source_index, target_index, stats
+            )
+        else:
+            path = graph.shortest_path(source_index, target_index, stats)
+        if path is None:
+            return None
+        return [(graph.movie_ids[movie], graph.person_ids[person])
+                for movie, person in path]
+    if bidirectional:
+        return bidirectional_search(source, target, stats)
+    return breadth_first_search(source, target, stats)
+
+
+def degrees_of_separation(source, target):
+    """
+    Returns the number of degrees between source and target, or None if
+    they are not connected. Answered from the landmark index alone when
+    its bounds are tight.
+    """
+    if landmarks is not None:
+        return landmarks.distance(
+            graph, graph.person_index(source), graph.person_index(target)
+        )
+    path = shortest_path(source, target)
+    return None if path is None else len(path)
+
+
+def breadth_first_search(source, target, stats=None):
+    """
+    Finds the shortest path from source to target with a one-sided
+    breadth-first search.
+    """
+    neighbors = neighbors_for_person
+    if stats is not None:
+        neighbors = stats.timed(neighbors)
 
-    # TODO
-    
     #creates a node from the first entered actor
-    start = Node(source, None, None)
+    start = Node(source, None, None, stats)
     
     #creates a queue frontier and adds the node of the first actor 
-    frontier = QueueFrontier()
+    frontier = QueueFrontier(stats)
     frontier.add(start)
     
     #creates a set of the explored nodes and a path to the target
@@ -115,10 +219,10 @@ def shortest_path(source, target):
         explored.add(node.state)
         
         #checks each neighbor for the node
-        for movie_id, person_id in neighbors_for_person(node.state):
+        for movie_id, person_id in neighbors(node.state):
             #if that node is not already explored and is not already in the frontier, add it to the frontier
             if person_id not in explored and not frontier.contains_state(person_id):
-                child = Node(person_id, node, movie_id)
+                child = Node(person_id, node, movie_id, stats)
                 frontier.add(child)
                 
             #if the neighbor node is the target, create the path
@@ -136,6 +240,93 @@ def shortest_path(source, target):
         
 
 
+def bidirectional_search(source, target, stats=None):
+    """
+    Finds the shortest path from source to target with a breadth-first
+    search that grows a frontier from each end, one whole level at a time,
+    always expanding the smaller side.
+    """
+    if source == target:
+        return []
+
+    neighbors = neighbors_for_person
+    if stats is not None:
+        neighbors = stats.timed(neighbors)
+        stats.nodes_created += 2
+
+    # Maps each reached person to the (movie_id, person_id) step that
+    # leads back towards the side's own root
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        if stats is not None:
+            stats.observe_frontier(
+                len(forward_frontier) + len(backward_frontier)
+            )
+
+        # Expand the smaller frontier to keep the search balanced
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, visited, other = forward_frontier, forward, backward
+        else:
+            frontier, visited, other = backward_frontier, backward, forward
+
+        # Finish the whole level so the first meeting found is the shortest
+        next_frontier = []
+        meeting = None
+        for person_id in frontier:
+            for movie_id, neighbor_id in neighbors(person_id):
+                if neighbor_id in visited:
+                    continue
+                visited[neighbor_id] = (movie_id, person_id)
+                if stats is not None:
+                    stats.nodes_created += 1
+                if neighbor_id in other:
+                    meeting = neighbor_id
+                    break
+                next_frontier.append(neighbor_id)
+            if meeting is not None:
+                break
+
+        if meeting is not None:
+            return join_paths(forward, backward, meeting)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return None
+
+
+def join_paths(forward, backward, meeting):
+    """
+    Builds the (movie_id, person_id) path through the person where the
+    forward and backward searches met.
+    """
+    path = []
+
+    # Walk back from the meeting point to the source
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent_id = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent_id
+    path.reverse()
+
+    # Walk forward from the meeting point to the target
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child_id = backward[person_id]
+        path.append((movie_id, child_id))
+        person_id = child_id
+
+    return path
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
@@ -143,7 +334,7 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
-        return None
+        return suggest_name(name)
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
         for person_id in person_ids:
@@ -162,11 +353,40 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def suggest_name(name):
+    """
+    Offers ranked candidates for a name with no exact match and returns
+    the IMDB id of the one chosen, or None.
+    """
+    global name_index
+    if name_index is None:
+        name_index = NameIndex(names)
+    candidates = name_index.candidates(name, limit=5)
+    if not candidates:
+        return None
+    print(f"No exact match for '{name}'. Did you mean:")
+    for i, candidate in enumerate(candidates, 1):
+        person_id = next(iter(names[candidate]))
+        print(f"{i}: {people[person_id]['name']}")
+    try:
+        choice = int(input("Intended number: "))
+        if 1 <= choice <= len(candidates):
+            return person_id_for_name(candidates[choice - 1])
+    except (EOFError, ValueError):
+        pass
+    return None
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return {(graph.movie_ids[movie], graph.person_ids[person])
+                for movie, person in graph.neighbors(
+                    graph.person_index(person_id))}
+
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
@@ -0,0 +1,114 @@
+"""
+Generates a synthetic dataset in the same CSV format as small/ and large/.
+
+Movie cast sizes follow a power law, and stars are drawn with a
+power-law popularity, so a few people appear in many movies and most
+appear in one or two, like the IMDB data. The same arguments and seed
+always produce the same files.
+
+Usage: python generate.py directory [--people N] [--movies M]
+                          [--max-cast C] [--alpha A] [--newcomers F]
+                          [--seed S]
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+
+FIRST_NAMES = [
+    "Alex", "Anna", "Ben", "Carla", "Chris", "Dana", "Eli", "Emma", "Frank",
+    "Grace", "Hugo", "Ivy", "Jack", "Julia", "Kevin", "Laura", "Leo", "Maya",
+    "Nina", "Omar", "Paul", "Rosa", "Sam", "Tara", "Tom", "Vera", "Will",
+    "Zoe"
+]
+LAST_NAMES = [
+    "Adams", "Bacon", "Brown", "Chen", "Cruz", "Davis", "Evans", "Garcia",
+    "Hanks", "Hill", "Jones", "Kim", "Lee", "Lopez", "Miller", "Moore",
+    "Nguyen", "Patel", "Reed", "Rossi", "Smith", "Stone", "Taylor", "Walker",
+    "Watson", "Young"
+]
+
+
+def power_law(rng, alpha, maximum):
+    """
+    Draws an integer in [1, maximum] from a Pareto distribution.
+    """
+    return min(maximum, int(rng.paretovariate(alpha)))
+
+
+def generate(directory, people, movies, max_cast=40, alpha=1.5,
+             newcomers=0.5, seed=0):
+    """
+    Writes people.csv, movies.csv and stars.csv to directory.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    # Person ids are spread out like IMDB ids rather than dense
+    person_ids = rng.sample(range(1, people * 10 + 1), people)
+    with open(os.path.join(directory, "people.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(["id", "name", "birth"])
+        for person_id in person_ids:
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            if rng.random() < 0.9:
+                name += f" {rng.choice(LAST_NAMES)}"
+            birth = rng.randint(1920, 2005) if rng.random() < 0.8 else ""
+            writer.writerow([person_id, name, birth])
+
+    movie_ids = rng.sample(range(1, movies * 10 + 1), movies)
+    with open(os.path.join(directory, "movies.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(["id", "title", "year"])
+        for number, movie_id in enumerate(movie_ids, 1):
+            writer.writerow([movie_id, f"Movie {number}",
+                             rng.randint(1930, 2023)])
+
+    # Popularity weights make star appearances follow a power law too,
+    # while a share of newcomers drawn uniformly keeps most people cast
+    popularity = [rng.paretovariate(alpha) for _ in range(people)]
+    cumulative = list(itertools.accumulate(popularity))
+    with open(os.path.join(directory, "stars.csv"), "w",
+              encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        for movie_id in movie_ids:
+            cast_size = power_law(rng, alpha, min(max_cast, people))
+            cast = set()
+            for _ in range(cast_size):
+                if rng.random() < newcomers:
+                    cast.add(rng.choice(person_ids))
+                else:
+                    cast.update(rng.choices(person_ids,
+                                            cum_weights=cumulative))
+            for person_id in cast:
+                writer.writerow([person_id, movie_id])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic degrees dataset."
+    )
+    parser.add_argument("directory", help="directory to write the CSVs to")
+    parser.add_argument("--people", type=int, default=100000)
+    parser.add_argument("--movies", type=int, default=50000)
+    parser.add_argument("--max-cast", type=int, default=40)
+    parser.add_argument("--alpha", type=float, default=1.5,
+                        help="power-law exponent for cast and popularity")
+    parser.add_argument("--newcomers", type=float, default=0.5,
+                        help="share of cast drawn uniformly from everyone")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate(args.directory, args.people, args.movies, args.max_cast,
+             args.alpha, args.newcomers, args.seed)
+    print(f"Wrote {args.people} people and {args.movies} movies "
+          f"to {args.directory}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+import csv
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+
+class StringTable():
+    """
+    List of strings packed into a single UTF-8 buffer plus an array of
+    offsets, instead of one Python object per string.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        data = bytearray()
+        offsets = array("q", [0])
+        for string in strings:
+            data += string.encode("utf-8")
+            offsets.append(len(data))
+        return cls(bytes(data), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+# Files a graph is built from, checked to decide whether a snapshot is stale
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+SNAPSHOT_NAME = "degrees.snapshot"
+SNAPSHOT_MAGIC = b"DEGSNAP1"
+
+# Plain arrays and string tables stored in a snapshot, in file order
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars",
+          "person_order", "movie_order", "name_order")
+TABLES = ("person_ids", "person_names", "person_births",
+          "movie_ids", "movie_titles", "movie_years")
+
+
+class StarGraph():
+    """
+    Bipartite graph of people and the movies they starred in.
+
+    People and movies are numbered with dense integers in file order, and
+    the edges are stored twice in CSR form: person_offsets/person_movies
+    list the movies of each person, movie_offsets/movie_stars list the
+    stars of each movie. The movies of person i are
+    person_movies[person_offsets[i]:person_offsets[i + 1]].
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_order, movie_order, name_order):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+
+        # Indices sorted by id (and by lowercase name) so lookups can
+        # binary search instead of keeping a dict of every string
+        self.person_order = person_order
+        self.movie_order = movie_order
+        self.name_order = name_order
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Builds the graph from the people, movies and stars CSV files.
+        """
+        person_index = {}
+        person_ids, person_names, person_births = [], [], []
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                person_index[row["id"]] = len(person_ids)
+                person_ids.append(row["id"])
+                person_names.append(row["name"])
+                person_births.append(row["birth"])
+
+        movie_index = {}
+        movie_ids, movie_titles, movie_years = [], [], []
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                movie_index[row["id"]] = len(movie_ids)
+                movie_ids.append(row["id"])
+                movie_titles.append(row["title"])
+                movie_years.append(row["year"])
+
+        # Collect each (person, movie) edge once, skipping unknown ids
+        seen = set()
+        edge_people = array("i")
+        edge_movies = array("i")
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    edge = (person_index[row["person_id"]],
+                            movie_index[row["movie_id"]])
+                except KeyError:
+                    continue
+                if edge not in seen:
+                    seen.add(edge)
+                    edge_people.append(edge[0])
+                    edge_movies.append(edge[1])
+        del seen
+
+        person_offsets, person_movies = compress(
+            len(person_ids), edge_people, edge_movies
+        )
+        movie_offsets, movie_stars = compress(
+            len(movie_ids), edge_movies, edge_people
+        )
+
+        person_order = sorted_order(person_ids)
+        movie_order = sorted_order(movie_ids)
+        name_order = sorted_order([name.lower() for name in person_names])
+
+        return cls(
+            StringTable.from_strings(person_ids),
+            StringTable.from_strings(person_names),
+            StringTable.from_strings(person_births),
+            StringTable.from_strings(movie_ids),
+            StringTable.from_strings(movie_titles),
+            StringTable.from_strings(movie_years),
+            person_offsets, person_movies, movie_offsets, movie_stars,
+            person_order, movie_order, name_order
+        )
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads the graph from the snapshot in directory, rebuilding it from
+        the CSV files and rewriting the snapshot if it is missing or stale.
+        """
+        path = os.path.join(directory, SNAPSHOT_NAME)
+        sources = source_stamps(directory)
+        graph = cls.from_snapshot(path, sources)
+        if graph is None:
+            graph = cls.from_csv(directory)
+            try:
+                graph.save_snapshot(path, sources)
+            except OSError:
+                # A read-only dataset directory just means no cache
+                pass
+        return graph
+
+    @classmethod
+    def from_snapshot(cls, path, sources):
+        """
+        Memory-maps a snapshot written by save_snapshot. The arrays are
+        read straight from the mapping, so nothing is parsed or copied up
+        front. Returns None if the snapshot is missing, unreadable or was
+        built from different source files.
+        """
+        opened = read_header(path, SNAPSHOT_MAGIC)
+        if opened is None:
+            return None
+        snapshot, header, end = opened
+        if (header.get("byteorder") != sys.byteorder
+                or header.get("sources") != sources):
+            return None
+
+        view = memoryview(snapshot)
+        start = align(end)
+        sections = {}
+        for name, typecode, offset, length in header["sections"]:
+            section = view[start + offset:start + offset + length]
+            sections[name] = section.cast(typecode)
+
+        fields = {name: sections[name] for name in ARRAYS}
+        for name in TABLES:
+            fields[name] = StringTable(
+                sections[f"{name}.data"], sections[f"{name}.offsets"]
+            )
+        graph = cls(**fields)
+        graph.snapshot = snapshot
+        return graph
+
+    def save_snapshot(self, path, sources):
+        """
+        Writes the graph to path as a JSON header followed by the raw,
+        8-byte aligned contents of every array.
+        """
+        sections = []
+        for name in ARRAYS:
+            sections.append((name, getattr(self, name)))
+        for name in TABLES:
+            table = getattr(self, name)
+            sections.append((f"{name}.data", table.data))
+            sections.append((f"{name}.offsets", table.offsets))
+
+        # Section offsets are relative to the aligned end of the header
+        layout = []
+        offset = 0
+        for name, values in sections:
+            values = memoryview(values)
+            layout.append((name, values.format, offset, values.nbytes))
+            offset += align(values.nbytes)
+        header = {"byteorder": sys.byteorder, "sources": sources,
+                  "sections": layout}
+
+        # Write to a temporary file first so readers never see half a file
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            end = write_header(f, SNAPSHOT_MAGIC, header)
+            f.write(bytes(align(end) - end))
+            for name, values in sections:
+                data = memoryview(values).cast("B")
+                f.write(data)
+                f.write(bytes(align(len(data)) - len(data)))
+        os.replace(temporary, path)
+
+    def person_count(self):
+        return len(self.person_offsets) - 1
+
+    def movie_count(self):
+        return len(self.movie_offsets) - 1
+
+    def person_index(self, person_id):
+        """
+        Returns the dense index of an IMDB person id.
+        Raises KeyError if the id is unknown.
+        """
+        return find(self.person_order, self.person_ids, person_id)
+
+    def movie_index(self, movie_id):
+        """
+        Returns the dense index of an IMDB movie id.
+        Raises KeyError if the id is unknown.
+        """
+        return find(self.movie_order, self.movie_ids, movie_id)
+
+    def people_named(self, name):
+        """
+        Returns the indices of every person whose lowercase name is name.
+        """
+        order = self.name_order
+        key = lambda i: self.person_names[i].lower()
+        start = bisect_left(order, name, key=key)
+        matches = []
+        while start < len(order) and key(order[start]) == name:
+            matches.append(order[start])
+            start += 1
+        return matches
+
+    def movies_for_person(self, person):
+        return self.person_movies[
+            self.person_offsets[person]:self.person_offsets[person + 1]
+        ]
+
+    def stars_for_movie(self, movie):
+        return self.movie_stars[
+            self.movie_offsets[movie]:self.movie_offsets[movie + 1]
+        ]
+
+    def neighbors(self, person):
+        """
+        Yields (movie, person) index pairs for people who starred with
+        the given person.
+        """
+        for movie in self.movies_for_person(person):
+            for star in self.stars_for_movie(movie):
+                yield movie, star
+
+    def shortest_path(self, source, target, stats=None, limit=None):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect source to target, or None if they are not connected.
+
+        Runs a level-by-level bidirectional breadth-first search. Each side
+        scans every movie at most once, since a second visit to the same
+        movie cannot reach anyone new. If stats is given, the search's
+        work is counted into it. If limit is given, only paths shorter
+        than limit are looked for, and None is returned if there is none.
+        """
+        if source == target:
+            return []
+
+        forward = {source: None}
+        backward = {target: None}
+        forward_movies = set()
+        backward_movies = set()
+        forward_frontier = [source]
+        backward_frontier = [target]
+        forward_depth = backward_depth = 0
+
+        path = None
+        while forward_frontier and backward_frontier and path is None:
+            # Once both sides have gone this deep without meeting, the
+            # next level can only join them with a path of that length
+            if (limit is not None
+                    and forward_depth + backward_depth + 1 >= limit):
+                break
+            if stats is not None:
+                stats.observe_frontier(
+                    len(forward_frontier) + len(backward_frontier)
+                )
+
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, visited, other, scanned = (
+                    forward_frontier, forward, backward, forward_movies
+                )
+            else:
+                frontier, visited, other, scanned = (
+                    backward_frontier, backward, forward, backward_movies
+                )
+
+            next_frontier = []
+            for person in frontier:
+                if stats is not None:
+                    stats.states_expanded += 1
+                    started = time.perf_counter()
+                for movie in self.movies_for_person(person):
+                    if movie in scanned:
+                        continue
+                    scanned.add(movie)
+                    for star in self.stars_for_movie(movie):
+                        if star in visited:
+                            continue
+                        visited[star] = (movie, person)
+                        if star in other:
+                            path = join(forward, backward, star)
+                            break
+                        next_frontier.append(star)
+                    if path is not None:
+                        break
+                # Like a neighbors call on the dict path, only the scan of
+                # this person's movies counts as neighbor time
+                if stats is not None:
+                    stats.neighbor_time += time.perf_counter() - started
+                if path is not None:
+                    break
+
+            if expand_forward:
+                forward_frontier = next_frontier
+                forward_depth += 1
+            else:
+                backward_frontier = next_frontier
+                backward_depth += 1
+
+        if stats is not None:
+            stats.nodes_created += len(forward) + len(backward)
+        return path
+
+    def people_view(self):
+        return PeopleView(self)
+
+    def movies_view(self):
+        return MoviesView(self)
+
+    def names_view(self):
+        return NamesView(self)
+
+
+class PeopleView(Mapping):
+    """
+    Read-only dict of person_id -> {name, birth, movies} over a StarGraph,
+    built on access so the graph never holds per-person dicts.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, person_id):
+        graph = self.graph
+        i = graph.person_index(person_id)
+        return {
+            "name": graph.person_names[i],
+            "birth": graph.person_births[i],
+            "movies": {graph.movie_ids[movie]
+                       for movie in graph.movies_for_person(i)}
+        }
+
+    def __iter__(self):
+        for i in range(self.graph.person_count()):
+            yield self.graph.person_ids[i]
+
+    def __len__(self):
+        return self.graph.person_count()
+
+
+class MoviesView(Mapping):
+    """
+    Read-only dict of movie_id -> {title, year, stars} over a StarGraph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, movie_id):
+        graph = self.graph
+        i = graph.movie_index(movie_id)
+        return {
+            "title": graph.movie_titles[i],
+            "year": graph.movie_years[i],
+            "stars": {graph.person_ids[star]
+                      for star in graph.stars_for_movie(i)}
+        }
+
+    def __iter__(self):
+        for i in range(self.graph.movie_count()):
+            yield self.graph.movie_ids[i]
+
+    def __len__(self):
+        return self.graph.movie_count()
+
+
+class NamesView(Mapping):
+    """
+    Read-only dict of lowercase name -> set of person_ids over a StarGraph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, name):
+        matches = self.graph.people_named(name)
+        if not matches:
+            raise KeyError(name)
+        return {self.graph.person_ids[i] for i in matches}
+
+    def __iter__(self):
+        previous = None
+        for i in self.graph.name_order:
+            name = self.graph.person_names[i].lower()
+            if name != previous:
+                yield name
+                previous = name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def source_stamps(directory):
+    """
+    Returns the size and modification time of each source CSV file.
+    """
+    stamps = {}
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamps[name] = [stat.st_size, stat.st_mtime_ns]
+    return stamps
+
+
+def read_header(path, magic):
+    """
+    Memory-maps a file written by write_header with the given magic
+    bytes. Returns (mapping, header, offset just past the header), or
+    None if the file is missing, unreadable or not of that kind.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    start = len(magic) + 8
+    if mapping[:len(magic)] != magic:
+        return None
+    length = int.from_bytes(mapping[len(magic):start], "little")
+    try:
+        header = json.loads(mapping[start:start + length])
+    except ValueError:
+        return None
+    if not isinstance(header, dict):
+        return None
+    return mapping, header, start + length
+
+
+def write_header(f, magic, header):
+    """
+    Writes magic bytes and a length-prefixed JSON header to f and returns
+    the offset just past them.
+    """
+    encoded = json.dumps(header).encode("utf-8")
+    f.write(magic)
+    f.write(len(encoded).to_bytes(8, "little"))
+    f.write(encoded)
+    return len(magic) + 8 + len(encoded)
+
+
+def align(size):
+    """
+    Rounds size up to a multiple of 8 bytes.
+    """
+    return (size + 7) & ~7
+
+
+def compress(count, sources, targets):
+    """
+    Groups the edges (sources[k], targets[k]) by source into CSR
+    offset and index arrays with a counting sort.
+    """
+    offsets = array("q", [0]) * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    indices = array("i", [0]) * len(sources)
+    position = offsets[:-1]
+    for source, target in zip(sources, targets):
+        indices[position[source]] = target
+        position[source] += 1
+    return offsets, indices
+
+
+def sorted_order(keys):
+    """
+    Returns an array of indices that lists keys in sorted order.
+    """
+    return array("i", sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def find(order, table, key):
+    """
+    Binary searches the sorted index order of table for key.
+    """
+    position = bisect_left(order, key, key=table.__getitem__)
+    if position < len(order) and table[order[position]] == key:
+        return order[position]
+    raise KeyError(key)
+
+
+def join(forward, backward, meeting):
+    """
+    Joins the forward and backward parent maps into a path through meeting.
+    """
+    path = []
+    person = meeting
+    while forward[person] is not None:
+        movie, parent = forward[person]
+        path.append((movie, person))
+        person = parent
+    path.reverse()
+
+    person = meeting
+    while backward[person] is not None:
+        movie, child = backward[person]
+        path.append((movie, child))
+        person = child
+    return path
@@ -0,0 +1,273 @@
+"""
+Landmark distance index for degrees-of-separation queries.
+
+A few well-connected actors are chosen as landmarks and the distance from
+each of them to every person is stored. By the triangle inequality, for
+any landmark L
+
+    |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t)
+
+When the bounds meet, a shortest path is read off the distance arrays
+without searching, and people in different components are told apart
+instantly. Otherwise the upper bound is the length of a known path, so
+the search only looks for a shorter one and skips its last, largest
+level when there is none. How often the bounds meet depends on the
+graph: on small-world graphs with few hops between most people they
+rarely do, and benchmark.py --landmarks reports the rate.
+
+Usage: python landmarks.py directory [count]
+"""
+
+import os
+import sys
+from array import array
+
+from graph import StarGraph, read_header, source_stamps, write_header
+
+LANDMARKS_NAME = "degrees.landmarks"
+LANDMARKS_MAGIC = b"DEGLMRK1"
+
+# Stored distance for people a landmark cannot reach
+UNREACHABLE = 255
+
+
+class LandmarkIndex():
+
+    def __init__(self, landmarks, distances, count):
+        # Person indices of the landmarks, and one row of distances each
+        self.landmarks = landmarks
+        self.distances = distances
+
+        # Number of landmarks asked for, which may be more than were found
+        self.count = count
+
+    @classmethod
+    def build(cls, graph, count=16):
+        """
+        Picks up to count landmarks, most-connected first, skipping anyone
+        within one degree of a landmark already chosen, and runs a
+        breadth-first search from each.
+        """
+        degree = [
+            sum(len(graph.stars_for_movie(movie))
+                for movie in graph.movies_for_person(person))
+            for person in range(graph.person_count())
+        ]
+        candidates = sorted(
+            range(graph.person_count()), key=degree.__getitem__, reverse=True
+        )
+
+        landmarks = array("i")
+        distances = []
+        for person in candidates:
+            if len(landmarks) == count or degree[person] == 0:
+                break
+            if any(row[person] <= 1 for row in distances):
+                continue
+            landmarks.append(person)
+            distances.append(distances_from(graph, person))
+        return cls(landmarks, distances, count)
+
+    @classmethod
+    def load(cls, path, sources, count):
+        """
+        Memory-maps an index written by save. Returns None if it is
+        missing, was built from different source files or was asked for
+        a different number of landmarks.
+        """
+        opened = read_header(path, LANDMARKS_MAGIC)
+        if opened is None:
+            return None
+        index, header, start = opened
+        if header.get("sources") != sources or header.get("count") != count:
+            return None
+
+        view = memoryview(index)
+        landmarks = array("i", header["landmarks"])
+        people = header["people"]
+        distances = [
+            view[start + k * people:start + (k + 1) * people]
+            for k in range(len(landmarks))
+        ]
+        result = cls(landmarks, distances, count)
+        result.index = index
+        return result
+
+    def save(self, path, sources):
+        """
+        Writes the index to path as a JSON header followed by one byte of
+        distance per person for each landmark.
+        """
+        people = len(self.distances[0]) if self.distances else 0
+        header = {
+            "sources": sources,
+            "count": self.count,
+            "landmarks": list(self.landmarks),
+            "people": people
+        }
+
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            write_header(f, LANDMARKS_MAGIC, header)
+            for row in self.distances:
+                f.write(row)
+        os.replace(temporary, path)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper, landmark) bounds on the distance between two
+        person indices, where landmark is the position of the landmark that
+        gives the upper bound. Returns None if a landmark proves they are
+        not connected, and upper is None if no landmark reaches both.
+        """
+        lower = 0
+        upper = None
+        best = None
+        for k, row in enumerate(self.distances):
+            s = row[source]
+            t = row[target]
+            if s == UNREACHABLE and t == UNREACHABLE:
+                continue
+            if s == UNREACHABLE or t == UNREACHABLE:
+                return None
+            lower = max(lower, abs(s - t))
+            if upper is None or s + t < upper:
+                upper = s + t
+                best = k
+        return lower, upper, best
+
+    def distance(self, graph, source, target):
+        """
+        Returns the number of degrees between two person indices, or None
+        if they are not connected, searching only when the bounds differ.
+        """
+        if source == target:
+            return 0
+        bounds = self.bounds(source, target)
+        if bounds is None:
+            return None
+        lower, upper, _ = bounds
+        if upper is None:
+            path = graph.shortest_path(source, target)
+            return None if path is None else len(path)
+        if lower < upper:
+            path = graph.shortest_path(source, target, limit=upper)
+            if path is not None:
+                return len(path)
+        return upper
+
+    def shortest_path(self, graph, source, target, stats=None):
+        """
+        Returns the shortest list of (movie, person) index pairs that
+        connect source to target, or None if they are not connected.
+
+        When the bounds differ, the search only looks for a path shorter
+        than the route through the best landmark, so it stops a level
+        early when there is none and takes that route instead.
+        """
+        if source == target:
+            return []
+        bounds = self.bounds(source, target)
+        if bounds is None:
+            return None
+        lower, upper, best = bounds
+        if upper is None:
+            return graph.shortest_path(source, target, stats)
+        if lower < upper:
+            path = graph.shortest_path(source, target, stats, limit=upper)
+            if path is not None:
+                return path
+
+        # The route through the landmark is as short as possible
+        row = self.distances[best]
+        there = descend(graph, row, source)
+        back = descend(graph, row, target)
+        return there + reverse(back, target)
+
+
+def distances_from(graph, source):
+    """
+    Returns a bytearray of the distance from source to every person,
+    by level-synchronous breadth-first search.
+    """
+    distances = bytearray([UNREACHABLE]) * graph.person_count()
+    distances[source] = 0
+    scanned = bytearray(graph.movie_count())
+    frontier = [source]
+    depth = 0
+    while frontier and depth < UNREACHABLE - 1:
+        depth += 1
+        next_frontier = []
+        for person in frontier:
+            for movie in graph.movies_for_person(person):
+                if scanned[movie]:
+                    continue
+                scanned[movie] = 1
+                for star in graph.stars_for_movie(movie):
+                    if distances[star] == UNREACHABLE:
+                        distances[star] = depth
+                        next_frontier.append(star)
+        frontier = next_frontier
+    return distances
+
+
+def descend(graph, row, person):
+    """
+    Follows decreasing landmark distances from person down to the
+    landmark, returning the (movie, person) steps taken.
+    """
+    steps = []
+    while row[person] != 0:
+        step = next(
+            (movie, star) for movie, star in graph.neighbors(person)
+            if row[star] == row[person] - 1
+        )
+        steps.append(step)
+        person = step[1]
+    return steps
+
+
+def reverse(steps, start):
+    """
+    Reverses a list of (movie, person) steps that begins at start.
+    """
+    people = [start] + [person for _, person in steps]
+    return [(steps[i][0], people[i]) for i in range(len(steps) - 1, -1, -1)]
+
+
+def load_or_build(graph, directory, count=16):
+    """
+    Returns the saved index for directory, building and saving a new one
+    if it is missing, stale or was built for a different count.
+    """
+    path = os.path.join(directory, LANDMARKS_NAME)
+    sources = source_stamps(directory)
+    index = LandmarkIndex.load(path, sources, count)
+    if index is None:
+        index = LandmarkIndex.build(graph, count)
+        try:
+            index.save(path, sources)
+        except OSError:
+            pass
+    return index
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python landmarks.py directory [count]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 16
+
+    print("Loading data...")
+    graph = StarGraph.load(directory)
+    print("Building landmarks...")
+    index = LandmarkIndex.build(graph, count)
+    index.save(os.path.join(directory, LANDMARKS_NAME),
+               source_stamps(directory))
+    for landmark in index.landmarks:
+        print(f"    {graph.person_names[landmark]}")
+    print(f"Saved {len(index.landmarks)} landmarks.")
+
+
+if __name__ == "__main__":
+    main()
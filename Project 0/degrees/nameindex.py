@@ -0,0 +1,128 @@
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+
+class NameIndex():
+    """
+    Index of lowercase names for prefix and fuzzy lookups.
+
+    Names are kept sorted so every name with a given prefix sits in one
+    contiguous run found by binary search. For fuzzy matches each name is
+    also listed under each of its trigrams, separately for names with
+    each number of trigrams, and candidates are ranked by how many
+    trigrams they share with the query.
+    """
+
+    def __init__(self, names):
+        self.keys = sorted(set(names))
+
+        # Maps (trigram count, trigram) to the positions in keys of names
+        # with that many trigrams containing it, in increasing order
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            grams = trigrams(key)
+            for gram in grams:
+                posting = self.postings.get((len(grams), gram))
+                if posting is None:
+                    posting = self.postings[len(grams), gram] = array("i")
+                posting.append(position)
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to limit names that start with prefix, in sorted order.
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        matches = []
+        for key in self.keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+        return matches
+
+    def similar(self, name, limit=10, threshold=0.5):
+        """
+        Returns up to limit names whose trigram similarity to name is at
+        least threshold, most similar first.
+        """
+        grams = trigrams(name.lower())
+        if not grams:
+            return []
+
+        scored = self.matches(grams, len(name), threshold, limit)
+        scored.sort()
+        return [key for _, _, key in scored[:limit]]
+
+    def matches(self, grams, length, floor, limit):
+        """
+        Returns (-score, length difference, name) for names scoring at
+        least floor against the trigrams grams, including the limit best.
+        """
+        g = len(grams)
+
+        # A name with k trigrams scores at most 2 min(g, k) / (g + k), so
+        # try the likeliest sizes first and stop once none can compete
+        low = math.ceil(floor * g / (2 - floor))
+        high = math.floor((2 - floor) * g / floor)
+        sizes = sorted(range(max(1, low), high + 1),
+                       key=lambda k: (-min(g, k) / (g + k), k))
+
+        scored = []
+        for k in sizes:
+            # Once limit names are found, only better ones are of interest
+            best = floor
+            if len(scored) >= limit:
+                best = max(best, -sorted(scored)[limit - 1][0])
+            if 2 * min(g, k) / (g + k) < best:
+                break
+            needed = math.ceil(best * (g + k) / 2 - 1e-9)
+
+            # A name sharing needed trigrams is in one of the rarest
+            # g - needed + 1 lists, so count shared trigrams from those
+            lists = sorted(
+                (self.postings.get((k, gram), ()) for gram in grams), key=len
+            )
+            split = g - needed + 1
+            shared = Counter()
+            for posting in lists[:split]:
+                shared.update(posting)
+
+            # Only candidates are counted in the longer lists, dropping
+            # those that can no longer share enough as the lists run out
+            for i, posting in enumerate(lists[split:], split):
+                if needed - (g - i) > 1:
+                    shared = {position: count
+                              for position, count in shared.items()
+                              if count + g - i >= needed}
+                for position in shared.keys() & posting:
+                    shared[position] += 1
+
+            for position, count in shared.items():
+                if count >= needed:
+                    key = self.keys[position]
+                    scored.append((-2 * count / (g + k),
+                                   abs(len(key) - length), key))
+        return scored
+
+    def candidates(self, name, limit=10):
+        """
+        Returns up to limit names ranked for a possibly mistyped name:
+        an exact match first, then names it is a prefix of, then
+        similar names.
+        """
+        name = name.lower()
+        ranked = []
+        for key in self.prefix(name, limit) + self.similar(name, limit):
+            if key not in ranked:
+                ranked.append(key)
+        return ranked[:limit]
+
+
+def trigrams(name):
+    """
+    Returns the set of three-character substrings of a padded name.
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
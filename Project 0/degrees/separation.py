@@ -0,0 +1,175 @@
+"""
+Computes degrees of separation from one or more actors to everyone else,
+like a table of Bacon numbers.
+
+Distances are written to a compact binary file: a JSON header followed
+by one byte per person for each source, in the graph's person order, with
+255 for people who cannot be reached. A histogram of each source's
+distances is printed as it finishes.
+
+Usage: python separation.py directory output [--source NAME_OR_ID ...]
+                            [--sample N] [--seed S] [--workers W]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import degrees
+from batch import resolve
+from graph import write_header
+from landmarks import UNREACHABLE, distances_from
+
+SEPARATION_MAGIC = b"DEGSEPR1"
+
+# Shared state inherited by forked workers for a parallel single-source BFS
+shared_distances = None
+shared_scanned = None
+
+
+def expand(people):
+    """
+    Returns the unvisited co-stars of a chunk of the current BFS level,
+    reading the shared distances. Workers only mark movies as scanned; a
+    race there can only cause a movie to be scanned twice.
+    """
+    graph = degrees.graph
+    found = []
+    for person in people:
+        for movie in graph.movies_for_person(person):
+            if shared_scanned[movie]:
+                continue
+            shared_scanned[movie] = 1
+            for star in graph.stars_for_movie(movie):
+                if shared_distances[star] == UNREACHABLE:
+                    found.append(star)
+    return found
+
+
+def parallel_distances_from(pool, source, workers):
+    """
+    Level-synchronous BFS from source whose levels are split across the
+    pool. Only this process writes distances, between levels.
+    """
+    graph = degrees.graph
+    shared_distances[:] = bytes([UNREACHABLE]) * graph.person_count()
+    shared_scanned[:] = bytes(graph.movie_count())
+    shared_distances[source] = 0
+
+    frontier = [source]
+    depth = 0
+    while frontier and depth < UNREACHABLE - 1:
+        depth += 1
+        size = max(1, len(frontier) // (workers * 4))
+        chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+        next_frontier = []
+        for found in pool.imap_unordered(expand, chunks):
+            for star in found:
+                if shared_distances[star] == UNREACHABLE:
+                    shared_distances[star] = depth
+                    next_frontier.append(star)
+        frontier = next_frontier
+    return bytes(shared_distances)
+
+
+def serial_distances_from(source):
+    return bytes(distances_from(degrees.graph, source))
+
+
+def histogram(row):
+    """
+    Returns a dict of distance -> number of people at that distance.
+    """
+    counts = {}
+    for distance in range(UNREACHABLE + 1):
+        count = row.count(distance)
+        if count:
+            counts[distance] = count
+    return counts
+
+
+def main():
+    global shared_distances, shared_scanned
+
+    parser = argparse.ArgumentParser(
+        description="Compute degrees of separation to everyone."
+    )
+    parser.add_argument("directory", help="dataset directory")
+    parser.add_argument("output", help="binary distance file to write")
+    parser.add_argument("--source", action="append", default=[],
+                        help="name or id of a source actor (repeatable)")
+    parser.add_argument("--sample", type=int, default=0,
+                        help="also add this many random source actors")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for --sample")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(args.directory, snapshot=True)
+    graph = degrees.graph
+
+    try:
+        sources = [graph.person_index(resolve(source))
+                   for source in args.source]
+    except ValueError as e:
+        sys.exit(str(e))
+    if args.sample:
+        rng = random.Random(args.seed)
+        sources += rng.sample(range(graph.person_count()),
+                              min(args.sample, graph.person_count()))
+    if not sources:
+        sys.exit("No source actors given.")
+
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        context = None
+    workers = args.workers if context is not None else 1
+
+    # One source splits each level across workers; several sources
+    # run one serial BFS per worker
+    if workers > 1 and len(sources) == 1:
+        shared_distances = context.RawArray("B", graph.person_count())
+        shared_scanned = context.RawArray("B", graph.movie_count())
+    pool = context.Pool(workers) if workers > 1 else None
+
+    header = {
+        "people": graph.person_count(),
+        "sources": [graph.person_ids[source] for source in sources]
+    }
+
+    start = time.perf_counter()
+    try:
+        if pool is None:
+            rows = map(serial_distances_from, sources)
+        elif len(sources) == 1:
+            rows = [parallel_distances_from(pool, sources[0], workers)]
+        else:
+            rows = pool.imap(serial_distances_from, sources)
+
+        with open(args.output, "wb") as f:
+            write_header(f, SEPARATION_MAGIC, header)
+            for source, row in zip(sources, rows):
+                f.write(row)
+                print(f"{graph.person_names[source]} "
+                      f"({graph.person_ids[source]}):")
+                for distance, count in histogram(row).items():
+                    if distance == UNREACHABLE:
+                        distance = "unreachable"
+                    print(f"    {distance}: {count}")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(sources)} sources in {elapsed:.2f}s.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,68 @@
+import heapq
+import itertools
+import time
+from collections import deque
+
+
+class SearchStats():
+    """
+    Counters filled in by a search when one is passed to it: nodes
+    created, states expanded, the largest frontier seen and the seconds
+    spent generating neighbors.
+    """
+
+    def __init__(self):
+        self.nodes_created = 0
+        self.states_expanded = 0
+        self.frontier_peak = 0
+        self.neighbor_time = 0.0
+
+    def __repr__(self):
+        return (f"SearchStats(nodes_created={self.nodes_created}, "
+                f"states_expanded={self.states_expanded}, "
+                f"frontier_peak={self.frontier_peak}, "
+                f"neighbor_time={self.neighbor_time:.6f})")
+
+    def observe_frontier(self, size):
+        if size > self.frontier_peak:
+            self.frontier_peak = size
+
+    def timed(self, neighbors):
+        """
+        Wraps a neighbor function so each call counts as one expanded
+        state and its running time is added to neighbor_time.
+        """
+        def timed_neighbors(state):
+            start = time.perf_counter()
+            result = neighbors(state)
+            self.neighbor_time += time.perf_counter() - start
+            self.states_expanded += 1
+            return result
+        return timed_neighbors
+
+
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, stats=None):
         self.state = state
         self.parent = parent
         self.action = action
+        if stats is not None:
+            stats.nodes_created += 1
 
 
 class StackFrontier():
-    def __init__(self):
-        self.frontier = []
+    def __init__(self, stats=None):
+        self.frontier = deque()
+        # Counts how many nodes in the frontier hold each state
+        self.states = {}
+        self.stats = stats
 
     def add(self, node):
         self.frontier.append(node)
+        self.track(node)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,10 +71,25 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.untrack(node)
             return node
 
+    def track(self, node):
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+        if self.stats is not None:
+            self.stats.observe_frontier(len(self.frontier))
+
+    def untrack(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+
+    def __len__(self):
+        return len(self.frontier)
+
 
 class QueueFrontier(StackFrontier):
 
@@ -33,6 +97,34 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.untrack(node)
+            return node
+
+
+class PriorityFrontier(StackFrontier):
+    """
+    Frontier that always removes the node with the lowest priority,
+    as computed by the given function of a node. Ties are broken by
+    insertion order.
+    """
+
+    def __init__(self, priority, stats=None):
+        super().__init__(stats)
+        self.frontier = []
+        self.priority = priority
+        self.counter = itertools.count()
+
+    def add(self, node):
+        heapq.heappush(
+            self.frontier, (self.priority(node), next(self.counter), node)
+        )
+        self.track(node)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            _, _, node = heapq.heappop(self.frontier)
+            self.untrack(node)
             return node
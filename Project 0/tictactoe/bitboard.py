@@ -0,0 +1,209 @@
+"""
+Bitboard representation of a tic-tac-toe board.
+
+A board is a pair of 9-bit integers (x, o), one per player, where bit
+3 * i + j is set if that player has marked cell (i, j). Applying or
+undoing a move is a single xor, and a win is a table lookup.
+"""
+
+import math
+
+X = "X"
+O = "O"
+EMPTY = None
+
+FULL = 0b111111111
+
+# The eight lines of three cells, as masks
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+# WINS[bits] is True if those cells contain a whole line
+WINS = [any(bits & mask == mask for mask in WIN_MASKS)
+        for bits in range(FULL + 1)]
+
+
+def from_board(board):
+    """
+    Converts a list-of-lists board into (x, o) bitboards.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Converts (x, o) bitboards into a list-of-lists board.
+    """
+    board = []
+    for i in range(3):
+        row = []
+        for j in range(3):
+            bit = 1 << (3 * i + j)
+            row.append(X if x & bit else O if o & bit else EMPTY)
+        board.append(row)
+    return board
+
+
+def to_action(cell):
+    """
+    Converts a cell number into an (i, j) action.
+    """
+    return divmod(cell, 3)
+
+
+def to_cell(action):
+    """
+    Converts an (i, j) action into a cell number.
+    """
+    return 3 * action[0] + action[1]
+
+
+def x_to_move(x, o):
+    return x.bit_count() == o.bit_count()
+
+
+def apply(x, o, cell):
+    """
+    Returns the bitboards after the player to move marks cell.
+    Applying the same move again undoes it.
+    """
+    if x_to_move(x, o):
+        return x ^ (1 << cell), o
+    return x, o ^ (1 << cell)
+
+
+def undo(x, o, cell):
+    """
+    Returns the bitboards before cell was marked.
+    """
+    bit = 1 << cell
+    if x & bit:
+        return x ^ bit, o
+    return x, o ^ bit
+
+
+def moves(x, o):
+    """
+    Yields the empty cells of the board.
+    """
+    empty = FULL & ~(x | o)
+    while empty:
+        bit = empty & -empty
+        yield bit.bit_length() - 1
+        empty ^= bit
+
+
+def utility(x, o):
+    """
+    Returns 1 if X has won, -1 if O has won, 0 otherwise.
+    """
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    return 0
+
+
+def terminal(x, o):
+    return WINS[x] or WINS[o] or (x | o) == FULL
+
+
+# Transposition table of (x, o) -> (value, flag), where the flag says
+# whether value is exact or only a bound
+transpositions = {}
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def search(x, o, alpha=-math.inf, beta=math.inf):
+    """
+    Returns the minimax value of the position for X, searched with
+    alpha-beta pruning and the transposition table.
+    """
+    if WINS[x]:
+        return 1
+    if WINS[o]:
+        return -1
+    if (x | o) == FULL:
+        return 0
+
+    entry = transpositions.get((x, o))
+    if entry is not None:
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+    window = (alpha, beta)
+
+    empty = FULL & ~(x | o)
+    if x.bit_count() == o.bit_count():
+        value = -math.inf
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            value = max(value, search(x | bit, o, alpha, beta))
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+    else:
+        value = math.inf
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            value = min(value, search(x, o | bit, alpha, beta))
+            beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+    if value <= window[0]:
+        flag = UPPER
+    elif value >= window[1]:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transpositions[(x, o)] = (value, flag)
+    return value
+
+
+def best_move(x, o):
+    """
+    Returns the optimal cell for the player to move, or None if the
+    game is over.
+    """
+    if terminal(x, o):
+        return None
+
+    best_cell = None
+    if x_to_move(x, o):
+        best_value = -math.inf
+        for cell in moves(x, o):
+            value = search(x | 1 << cell, o, best_value, math.inf)
+            if value > best_value:
+                best_value, best_cell = value, cell
+            if best_value == 1:
+                break
+    else:
+        best_value = math.inf
+        for cell in moves(x, o):
+            value = search(x, o | 1 << cell, -math.inf, best_value)
+            if value < best_value:
+                best_value, best_cell = value, cell
+            if best_value == -1:
+                break
+    return best_cell
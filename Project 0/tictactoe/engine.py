@@ -0,0 +1,278 @@
+"""
+Search engine for m,n,k games: tic-tac-toe on a board of any number of
+rows and columns, won by the first player with k marks in a row.
+
+Boards are bitboards with one padding bit at the end of every row, so
+cell (i, j) is bit i * (columns + 1) + j and shifting a mask never wraps
+from one row into the next. A line of k is then found with k - 1 shifts
+per direction instead of testing every line.
+
+Moves are chosen by iterative-deepening alpha-beta search under a
+wall-clock budget. Each completed depth is a usable answer, so a move is
+always ready when time runs out however large the board is.
+"""
+
+import functools
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a won position, well above any heuristic evaluation. Wins are
+# scored WIN - ply so quicker wins (and slower losses) are preferred
+WIN = 10 ** 9
+
+# Largest transposition table kept between moves
+MAX_TRANSPOSITIONS = 1_000_000
+
+# Whether a stored value is exact or only a bound
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class Timeout(Exception):
+    pass
+
+
+class SearchState():
+    """
+    Deadline, cancel event and node count of one best_move call, kept
+    apart from the shared Game so a search still unwinding in another
+    thread never picks up those of a newer one.
+    """
+
+    def __init__(self, time_limit, cancelled):
+        self.deadline = time.perf_counter() + time_limit
+        self.cancelled = cancelled
+        self.nodes = 0
+
+
+class Game():
+
+    def __init__(self, rows, columns, k):
+        if not 1 <= k <= max(rows, columns):
+            raise ValueError(f"cannot get {k} in a row on {rows}x{columns}")
+        self.rows = rows
+        self.columns = columns
+        self.k = k
+        self.stride = columns + 1
+
+        self.cells = [self.bit(i, j) for i in range(rows)
+                      for j in range(columns)]
+        self.full = sum(1 << cell for cell in self.cells)
+
+        # Shifts for right, down, down-left and down-right neighbors
+        self.directions = (1, self.stride, self.stride - 1, self.stride + 1)
+
+        # Every line of k cells, for the heuristic evaluation
+        self.lines = []
+        for i in range(rows):
+            for j in range(columns):
+                for di, dj in ((0, 1), (1, 0), (1, -1), (1, 1)):
+                    end_i = i + di * (k - 1)
+                    end_j = j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < columns:
+                        self.lines.append(sum(
+                            1 << self.bit(i + di * step, j + dj * step)
+                            for step in range(k)
+                        ))
+
+        # Static move order: cells on more lines first, which puts
+        # central cells ahead of edges and corners
+        self.order = sorted(
+            self.cells,
+            key=lambda cell: -sum(1 for line in self.lines
+                                  if line >> cell & 1)
+        )
+
+        # Transposition table of (x, o) -> (depth, value, flag, best cell)
+        self.transpositions = {}
+
+        # Nodes searched by the last best_move call to finish
+        self.nodes = 0
+
+    def bit(self, i, j):
+        return i * self.stride + j
+
+    def from_board(self, board):
+        """
+        Converts a list-of-lists board into (x, o) bitboards.
+        """
+        x = o = 0
+        for i in range(self.rows):
+            for j in range(self.columns):
+                if board[i][j] == X:
+                    x |= 1 << self.bit(i, j)
+                elif board[i][j] == O:
+                    o |= 1 << self.bit(i, j)
+        return x, o
+
+    def to_action(self, cell):
+        return divmod(cell, self.stride)
+
+    def has_won(self, bits):
+        """
+        Returns True if bits contains k in a row in any direction.
+        """
+        for shift in self.directions:
+            run = bits
+            for step in range(1, self.k):
+                run &= bits >> (shift * step)
+                if not run:
+                    break
+            if run:
+                return True
+        return False
+
+    def evaluate(self, mine, theirs):
+        """
+        Scores a position for the player who owns mine by the lines each
+        player could still complete, weighting fuller lines far more.
+        """
+        score = 0
+        for line in self.lines:
+            if line & theirs:
+                if not line & mine:
+                    score -= 4 ** (line & theirs).bit_count()
+            elif line & mine:
+                score += 4 ** (line & mine).bit_count()
+        return score
+
+    def winner(self, x, o):
+        if self.has_won(x):
+            return X
+        if self.has_won(o):
+            return O
+        return None
+
+    def best_move(self, board, time_limit=1.0, max_depth=None,
+                  cancelled=None):
+        """
+        Returns the best (i, j) action found for the player to move
+        within time_limit seconds, or None if the game is over.
+
+        cancelled may be a threading.Event; setting it ends the search
+        early as if time had run out.
+        """
+        x, o = self.from_board(board)
+        if self.winner(x, o) is not None or (x | o) == self.full:
+            return None
+        if x.bit_count() == o.bit_count():
+            mine, theirs = x, o
+        else:
+            mine, theirs = o, x
+
+        empty = (self.full & ~(x | o)).bit_count()
+        if max_depth is None or max_depth > empty:
+            max_depth = empty
+        if len(self.transpositions) > MAX_TRANSPOSITIONS:
+            self.transpositions.clear()
+
+        search = SearchState(time_limit, cancelled)
+        best = next(cell for cell in self.order
+                    if not (x | o) >> cell & 1)
+        for depth in range(1, max_depth + 1):
+            try:
+                value, cell = self.root(search, mine, theirs, depth)
+            except Timeout:
+                break
+            best = cell
+            # A forced win or loss will not change with more depth
+            if abs(value) >= WIN - max_depth:
+                break
+        self.nodes = search.nodes
+        return self.to_action(best)
+
+    def root(self, search, mine, theirs, depth):
+        """
+        Searches every move at the root to the given depth and returns
+        (value, best cell) for the player to move.
+        """
+        alpha = -WIN - 1
+        best = None
+        for cell in self.moves(mine, theirs):
+            value = -self.negamax(search, theirs, mine | 1 << cell,
+                                  depth - 1, -WIN - 1, -alpha, 1)
+            if best is None or value > alpha:
+                alpha = value
+                best = cell
+        self.transpositions[(mine, theirs)] = (depth, alpha, EXACT, best)
+        return alpha, best
+
+    def moves(self, mine, theirs):
+        """
+        Returns the empty cells, best first: the move the transposition
+        table recorded as best, then the static order.
+        """
+        occupied = mine | theirs
+        ordered = [cell for cell in self.order if not occupied >> cell & 1]
+        entry = self.transpositions.get((mine, theirs))
+        if entry is not None and entry[3] is not None:
+            ordered.remove(entry[3])
+            ordered.insert(0, entry[3])
+        return ordered
+
+    def negamax(self, search, mine, theirs, depth, alpha, beta, ply):
+        """
+        Returns the value for the player who owns mine, who is to move,
+        searching depth more moves within the (alpha, beta) window.
+        """
+        search.nodes += 1
+        if search.nodes & 255 == 0 and (
+            time.perf_counter() > search.deadline
+            or search.cancelled is not None and search.cancelled.is_set()
+        ):
+            raise Timeout
+
+        # The opponent just moved, so only they can have won
+        if self.has_won(theirs):
+            return -(WIN - ply)
+        if (mine | theirs) == self.full:
+            return 0
+        if depth == 0:
+            return self.evaluate(mine, theirs)
+
+        entry = self.transpositions.get((mine, theirs))
+        if entry is not None and entry[0] >= depth:
+            _, value, flag, _ = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+        window = (alpha, beta)
+
+        value = -WIN - 1
+        best = None
+        for cell in self.moves(mine, theirs):
+            score = -self.negamax(search, theirs, mine | 1 << cell,
+                                  depth - 1, -beta, -alpha, ply + 1)
+            if score > value:
+                value = score
+                best = cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if value <= window[0]:
+            flag = UPPER
+        elif value >= window[1]:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transpositions[(mine, theirs)] = (depth, value, flag, best)
+        return value
+
+
+@functools.lru_cache(maxsize=None)
+def game(rows, columns, k):
+    """
+    Returns the shared Game for a board size, so its transposition table
+    carries over from one move to the next.
+    """
+    return Game(rows, columns, k)
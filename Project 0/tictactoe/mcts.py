@@ -0,0 +1,164 @@
+"""
+Monte Carlo tree search player for boards too large for minimax.
+
+Each worker process grows its own search tree from the current board with
+random playouts, using the rules in tictactoe.py. When the iteration or
+time limit is reached, the root statistics from every tree are merged and
+the most visited action is played. This is root parallelization, so move
+quality scales with the number of cores.
+"""
+
+import functools
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import tictactoe as ttt
+
+# Exploration constant for the UCT formula
+EXPLORATION = math.sqrt(2)
+
+
+class Node():
+    def __init__(self, board, parent, action, rng):
+        self.board = board
+        self.parent = parent
+        self.action = action
+        self.children = []
+
+        # Actions not yet expanded, in random order
+        self.untried = []
+        if not ttt.terminal(board):
+            self.untried = sorted(ttt.actions(board))
+            rng.shuffle(self.untried)
+
+        # Player whose move led here; wins are counted for them
+        self.mover = ttt.O if ttt.player(board) == ttt.X else ttt.X
+        self.visits = 0
+        self.wins = 0.0
+
+    def select(self):
+        """
+        Returns the child with the highest upper confidence bound.
+        """
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: (child.wins / child.visits
+                               + EXPLORATION * math.sqrt(log_visits
+                                                         / child.visits))
+        )
+
+
+def playout(board, rng):
+    """
+    Plays random moves until the game ends and returns the winner.
+    """
+    while not ttt.terminal(board):
+        board = ttt.result(board, rng.choice(sorted(ttt.actions(board))))
+    return ttt.winner(board)
+
+
+def search_tree(board, iterations, time_limit, seed, config):
+    """
+    Grows one tree from board and returns {action: visits} for the
+    root's children. config is (rows, columns, k), so worker processes
+    use the same rules as the caller.
+    """
+    ttt.configure(*config, move_time=ttt.MOVE_TIME)
+    rng = random.Random(seed)
+    deadline = None
+    if time_limit is not None:
+        deadline = time.perf_counter() + time_limit
+    root = Node(board, None, None, rng)
+
+    count = 0
+    while ((iterations is None or count < iterations)
+           and (deadline is None or time.perf_counter() < deadline)):
+        count += 1
+
+        # Selection: descend through fully expanded nodes
+        node = root
+        while not node.untried and node.children:
+            node = node.select()
+
+        # Expansion: add one untried action
+        if node.untried:
+            action = node.untried.pop()
+            child = Node(ttt.result(node.board, action), node, action, rng)
+            node.children.append(child)
+            node = child
+
+        # Simulation and backpropagation
+        winner = playout(node.board, rng)
+        while node is not None:
+            node.visits += 1
+            if winner == node.mover:
+                node.wins += 1
+            elif winner is None:
+                node.wins += 0.5
+            node = node.parent
+
+    return {child.action: child.visits for child in root.children}
+
+
+@functools.lru_cache(maxsize=None)
+def pool(workers):
+    """
+    Returns a pool of worker processes, started on first use and kept for
+    later moves so its startup is paid once.
+    """
+    return multiprocessing.Pool(workers)
+
+
+def mcts(board, iterations=None, time_limit=1.0, workers=None, seed=None):
+    """
+    Returns the action chosen by Monte Carlo tree search for the player
+    to move, or None if the game is over.
+
+    Searching stops after iterations playouts in total or time_limit
+    seconds, whichever comes first; pass None to disable either limit.
+    The work is split across workers processes (all cores by default),
+    which are kept between calls; starting them counts against the time
+    limit.
+    """
+    start = time.perf_counter()
+    if ttt.terminal(board):
+        return None
+    if iterations is None and time_limit is None:
+        raise ValueError("an iteration or time limit is required")
+    if iterations is not None and iterations < 1:
+        raise ValueError("iterations must be positive")
+
+    workers = workers or os.cpu_count() or 1
+    if iterations is not None:
+        workers = min(workers, iterations)
+    workers_pool = pool(workers) if workers > 1 else None
+
+    # Split the playouts as evenly as they go, the first few workers
+    # taking one more
+    shares = [None] * workers
+    if iterations is not None:
+        shares = [iterations // workers + (i < iterations % workers)
+                  for i in range(workers)]
+    if time_limit is not None:
+        time_limit = max(0.0, time_limit - (time.perf_counter() - start))
+
+    rng = random.Random(seed)
+    config = (len(board), len(board[0]), ttt.K)
+    jobs = [(board, share, time_limit, rng.getrandbits(32), config)
+            for share in shares]
+
+    if workers_pool is None:
+        trees = [search_tree(*jobs[0])]
+    else:
+        trees = workers_pool.starmap(search_tree, jobs)
+
+    # Merge the root statistics of every tree
+    visits = {}
+    for tree in trees:
+        for action, count in tree.items():
+            visits[action] = visits.get(action, 0) + count
+    return max(sorted(visits), key=visits.__getitem__)
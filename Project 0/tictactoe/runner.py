@@ -1,9 +1,51 @@
 import pygame
 import sys
+import threading
 import time
 
 import tictactoe as ttt
 
+
+class Search():
+    """
+    Runs ttt.minimax on a background thread so the window keeps drawing
+    while the computer thinks. Poll done, then read move, or error if
+    the search raised.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.move = None
+        self.error = None
+        self.done = False
+        self.started = time.time()
+        self.cancelled = threading.Event()
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+
+    def run(self):
+        try:
+            move = ttt.minimax(self.board, cancelled=self.cancelled)
+            if not self.cancelled.is_set():
+                self.move = move
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+# Board size from the command line: python runner.py [rows columns k]
+if len(sys.argv) not in [1, 4]:
+    sys.exit("Usage: python runner.py [rows columns k]")
+if len(sys.argv) == 4:
+    try:
+        ttt.configure(*(int(arg) for arg in sys.argv[1:]))
+    except ValueError as e:
+        sys.exit(f"Invalid board: {e}")
+
 pygame.init()
 size = width, height = 600, 400
 
@@ -13,18 +55,28 @@ white = (255, 255, 255)
 
 screen = pygame.display.set_mode(size)
 
+# Shrink the tiles to fit larger boards in the window
+tile_size = int(min(80, (height - 120) / ttt.ROWS,
+                    (width - 40) / ttt.COLUMNS))
+
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", tile_size * 3 // 4)
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+search = None
+clock = pygame.time.Clock()
+
+# Shortest time the computer appears to think, so its move is visible
+ai_delay = 0.5
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            if search is not None:
+                search.cancel()
             sys.exit()
 
     screen.fill(black)
@@ -67,13 +119,12 @@ while True:
     else:
 
         # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
+        tile_origin = (width / 2 - (ttt.COLUMNS / 2 * tile_size),
+                       height / 2 - (ttt.ROWS / 2 * tile_size))
         tiles = []
-        for i in range(3):
+        for i in range(ttt.ROWS):
             row = []
-            for j in range(3):
+            for j in range(ttt.COLUMNS):
                 rect = pygame.Rect(
                     tile_origin[0] + j * tile_size,
                     tile_origin[1] + i * tile_size,
@@ -102,34 +153,39 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            dots = "." * (int(time.time() * 3) % 3 + 1)
+            title = f"Computer thinking{dots:<3}"
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, starting a search if there is none yet and
+        # playing its move once it is done
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if search is None:
+                search = Search(board)
+            elif search.done and search.error is not None:
+                raise search.error
+            elif search.done and time.time() - search.started >= ai_delay:
+                board = ttt.result(board, search.move)
+                search = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
         if click == 1 and user == player and not game_over:
             mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
+            for i in range(ttt.ROWS):
+                for j in range(ttt.COLUMNS):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
                         board = ttt.result(board, (i, j))
 
-        if game_over:
+        # Offer to play again when the game is over, or to reset while
+        # the computer is thinking
+        if game_over or search is not None:
             againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
+            label = "Play Again" if game_over else "Reset"
+            again = mediumFont.render(label, True, black)
             againRect = again.get_rect()
             againRect.center = againButton.center
             pygame.draw.rect(screen, white, againButton)
@@ -139,8 +195,11 @@ while True:
                 mouse = pygame.mouse.get_pos()
                 if againButton.collidepoint(mouse):
                     time.sleep(0.2)
+                    if search is not None:
+                        search.cancel()
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    search = None
 
     pygame.display.flip()
+    clock.tick(60)
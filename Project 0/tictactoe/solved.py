@@ -0,0 +1,166 @@
+"""
+Table of every reachable tic-tac-toe position, solved ahead of time.
+
+Positions that are rotations or reflections of each other have the same
+value, so only the smallest of the eight symmetric (x, o) forms of each
+is stored, with its value and best cell. A lookup canonicalizes the
+position, finds it in the table and maps the stored cell back.
+
+The table is written to solved.bin by running this file, and loaded the
+first time it is needed. Without the file it is solved in memory instead.
+
+Usage: python solved.py
+"""
+
+import os
+import sys
+from array import array
+
+import bitboard
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "solved.bin")
+
+# Stored cell for terminal positions, which have no move
+NO_MOVE = 15
+
+# The eight symmetries of the board as permutations of cells: cell c of
+# a position becomes cell SYMMETRIES[s][c] after symmetry s
+SYMMETRIES = []
+for turns in range(4):
+    for reflect in (False, True):
+        permutation = []
+        for cell in range(9):
+            i, j = divmod(cell, 3)
+            if reflect:
+                j = 2 - j
+            for _ in range(turns):
+                i, j = j, 2 - i
+            permutation.append(3 * i + j)
+        SYMMETRIES.append(permutation)
+
+# TRANSFORMS[s][bits] is the mask bits after symmetry s
+TRANSFORMS = [
+    [sum(1 << permutation[cell] for cell in range(9) if bits >> cell & 1)
+     for bits in range(bitboard.FULL + 1)]
+    for permutation in SYMMETRIES
+]
+
+# Cell number -> the cell it came from, for each symmetry
+INVERSES = [
+    [permutation.index(cell) for cell in range(9)]
+    for permutation in SYMMETRIES
+]
+
+# Maps canonical key -> (value, cell), loaded on first use
+table = None
+
+
+def canonical(x, o):
+    """
+    Returns (key, symmetry) for the smallest symmetric form of the
+    position, where key packs it as x | o << 9.
+    """
+    best = None
+    for s, transform in enumerate(TRANSFORMS):
+        key = transform[x] | transform[o] << 9
+        if best is None or key < best[0]:
+            best = (key, s)
+    return best
+
+
+def build():
+    """
+    Solves every position reachable from the empty board and returns
+    the table of canonical key -> (value, cell).
+    """
+    solved = {}
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        key, _ = canonical(x, o)
+        if key in solved:
+            continue
+
+        # Solve the canonical form itself so its best cell needs no mapping
+        cx, co = key & bitboard.FULL, key >> 9
+        value = bitboard.search(cx, co)
+        cell = bitboard.best_move(cx, co)
+        solved[key] = (value, NO_MOVE if cell is None else cell)
+        if cell is not None:
+            for move in bitboard.moves(x, o):
+                stack.append(bitboard.apply(x, o, move))
+    return solved
+
+
+def save(solved, path=TABLE_PATH):
+    """
+    Writes the table as sorted little-endian 32-bit records of
+    key << 8 | (value + 1) << 4 | cell.
+    """
+    records = array("I", sorted(
+        key << 8 | (value + 1) << 4 | cell
+        for key, (value, cell) in solved.items()
+    ))
+    if sys.byteorder == "big":
+        records.byteswap()
+    with open(path, "wb") as f:
+        records.tofile(f)
+
+
+def load(path=TABLE_PATH):
+    """
+    Reads a table written by save, or returns None if there is none.
+    """
+    records = array("I")
+    try:
+        with open(path, "rb") as f:
+            records.frombytes(f.read())
+    except OSError:
+        return None
+    if sys.byteorder == "big":
+        records.byteswap()
+    return {
+        record >> 8: ((record >> 4 & 0b1111) - 1, record & 0b1111)
+        for record in records
+    }
+
+
+def lookup(x, o):
+    """
+    Returns (value, cell) for the position, where value is 1 if X wins,
+    -1 if O wins and 0 for a draw with best play, and cell is the best
+    move or None if the game is over.
+    """
+    global table
+    if table is None:
+        table = load()
+        if table is None:
+            table = build()
+    key, s = canonical(x, o)
+    if key not in table:
+        # Not reachable in a legal game, so search it directly
+        cell = bitboard.best_move(x, o)
+        return bitboard.search(x, o), cell
+    value, cell = table[key]
+    if cell == NO_MOVE:
+        return value, None
+    return value, INVERSES[s][cell]
+
+
+def best_move(x, o):
+    """
+    Returns the optimal cell for the player to move, or None if the
+    game is over.
+    """
+    return lookup(x, o)[1]
+
+
+def main():
+    solved = build()
+    save(solved)
+    print(f"Solved {len(solved)} positions into {TABLE_PATH}.")
+
+
+if __name__ == "__main__":
+    main()
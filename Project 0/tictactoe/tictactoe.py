@@ -2,21 +2,42 @@
 Tic Tac Toe Player
 """
 
-import math
 import copy
 
+import bitboard
+import engine
+import solved
+
 X = "X"
 O = "O"
 EMPTY = None
 
+# Board size and how many in a row win; change them with configure()
+ROWS = 3
+COLUMNS = 3
+K = 3
+
+# Seconds minimax may search for a move on boards too large to solve
+MOVE_TIME = 1.0
+
+
+def configure(rows=3, columns=3, k=3, move_time=1.0):
+    """
+    Sets the board size, the number in a row needed to win and the time
+    budget per computer move for new games.
+    """
+    global ROWS, COLUMNS, K, MOVE_TIME
+
+    #make sure k in a row is possible on the board
+    engine.game(rows, columns, k)
+    ROWS, COLUMNS, K, MOVE_TIME = rows, columns, k, move_time
+
 
 def initial_state():
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return [[EMPTY] * COLUMNS for _ in range(ROWS)]
 
 
 def player(board):
@@ -29,16 +50,13 @@ def player(board):
     O_count = 0
     
     #loop through the board and add to the respective counts
-    for i in range(3):
-        for j in range(3):
+    for i in range(len(board)):
+        for j in range(len(board[0])):
             if board[i][j] == X:
                 X_count += 1
             if board[i][j] == O:
                 O_count += 1
     
-    #if the board is all empty, it is player X's turn
-    if board == initial_state():
-        return X
     #if there are more X moves than O moves, then it is player O's turn
     if X_count > O_count:
         return O
@@ -56,8 +74,8 @@ def actions(board):
     actions = set()
     
     #if a spot on the board is empty, then it is a possible action
-    for i in range(3):
-        for j in range(3):
+    for i in range(len(board)):
+        for j in range(len(board[0])):
             if board[i][j] == EMPTY:
                 actions.add((i,j))
     
@@ -86,31 +104,9 @@ def winner(board):
     Returns the winner of the game, if there is one.
     """
     
-    #checks the rows for 3 in a row
-    for i in range(3):
-        if (board[i][0] == board[i][1] == board[i][2] == X):
-            return X
-        elif (board[i][0] == board[i][1] == board[i][2] == O):
-            return O
-        
-    #checks the columns for 3 in a row
-    for j in range(3):
-        if (board[0][j] == board[1][j] == board[2][j] == X):
-            return X
-        elif (board[0][j] == board[1][j] == board[2][j] == O):
-            return O
-    
-    #checks the diagonals
-    if (board[0][0] == board[1][1] == board[2][2] == X):
-        return X
-    elif (board[0][0] == board[1][1] == board[2][2] == O):
-        return O
-    elif (board[2][0] == board[1][1] == board[0][2] == X):
-        return X
-    elif (board[2][0] == board[1][1] == board[0][2] == O):
-        return O
-    
-    return None
+    #checks every row, column and diagonal for K in a row on bitboards
+    game = engine.game(len(board), len(board[0]), K)
+    return game.winner(*game.from_board(board))
 
 
 def terminal(board):
@@ -152,50 +148,27 @@ def utility(board):
         return 0
 
 
-def minimax(board):
+def minimax(board, time_limit=None, cancelled=None):
     """
     Returns the optimal action for the current player on the board.
+
+    Boards too large to solve get the best action found by iterative
+    deepening within time_limit seconds (MOVE_TIME by default), or until
+    the cancelled event, if given, is set.
     """
     
     #if the game is over, there is no optimal action
     if terminal(board):
         return None
     
-    #if the player is X, maximize the value 
-    #if the player is O, minimize the value
-    else: 
-        for action in actions(board):
-            if player(board) == X:
-                if maximize(board) == minimize(result(board, action)):
-                    return action
-        
-            elif player(board) == O:
-                if minimize(board) == maximize(result(board, action)):
-                    return action
-       
-   
-def maximize(board):
-    if terminal(board):
-        return utility(board)
-    
-    value = float('-inf')
-    #for all the possible actions, find the value that will maximize the value
-    for action in actions(board):
-        #changes the value to whatever value is bigger between the result of the action and the current value
-        value = max(value, minimize(result(board, action)))
-        
-    return value
-    
-    
-def minimize(board):
-    if terminal(board):
-        return utility(board)
-    
-    value = float('inf')
-    #for all the possible actions, find the value that will minimize the value
-    for action in actions(board):
-        #changes the value to whatever value is smaller between the result of the action and the current value
-        value = min(value, maximize(result(board, action)))
-        
-    return value
-    
\ No newline at end of file
+    #look 3x3 positions up in the table of solved positions, which is
+    #loaded (or solved on bitboards) the first time it is needed
+    if len(board) == 3 and len(board[0]) == 3 and K == 3:
+        cell = solved.best_move(*bitboard.from_board(board))
+        return bitboard.to_action(cell)
+    
+    #otherwise search with a time budget
+    if time_limit is None:
+        time_limit = MOVE_TIME
+    game = engine.game(len(board), len(board[0]), K)
+    return game.best_move(board, time_limit, cancelled=cancelled)
@@ -0,0 +1,200 @@
+"""
+Headless tournament and search benchmark for the tic-tac-toe engines.
+
+Every pair of the listed engines (each engine against itself included)
+plays the given number of games, alternating who plays X. Games run in
+parallel across worker processes with a fixed seed per game, so results
+are reproducible. For each engine the results, the nodes searched per
+move and the move latency percentiles are reported. Moves answered from
+the solved 3x3 table are counted apart, as table hits, so they do not
+hide the search effort behind a node count of 0.
+
+Engines:
+    minimax  tictactoe.minimax (solved table on 3x3, engine otherwise)
+    engine   iterative-deepening alpha-beta search on any board
+    mcts     Monte Carlo tree search with a fixed number of playouts
+    random   a uniformly random legal move
+
+Usage: python tournament.py [engine ...] [--games N] [--workers W]
+                            [--board ROWS COLUMNS K] [--move-time T]
+                            [--playouts P] [--seed S] [--output FILE]
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import time
+
+import engine
+import mcts
+import tictactoe as ttt
+
+
+def play_minimax(board, rng, options):
+    action = ttt.minimax(board, time_limit=options["move_time"])
+    if len(board) == 3 and len(board[0]) == 3 and ttt.K == 3:
+        # Answered from the solved table without searching
+        return action, None
+    return action, engine.game(len(board), len(board[0]), ttt.K).nodes
+
+
+def play_engine(board, rng, options):
+    game = engine.game(len(board), len(board[0]), ttt.K)
+    action = game.best_move(board, options["move_time"])
+    return action, game.nodes
+
+
+def play_mcts(board, rng, options):
+    action = mcts.mcts(board, iterations=options["playouts"],
+                       time_limit=None, workers=1, seed=rng.getrandbits(32))
+    return action, options["playouts"]
+
+
+def play_random(board, rng, options):
+    return rng.choice(sorted(ttt.actions(board))), 0
+
+
+ENGINES = {
+    "minimax": play_minimax,
+    "engine": play_engine,
+    "mcts": play_mcts,
+    "random": play_random
+}
+
+
+def play_game(job):
+    """
+    Plays one game and returns a record of its players, winner and moves.
+    """
+    x_engine, o_engine, seed, options = job
+    rows, columns, k = options["board"]
+
+    # Start from an empty transposition table, so a game's node counts do
+    # not depend on which games its worker happened to play before
+    engine.game.cache_clear()
+    ttt.configure(rows, columns, k, options["move_time"])
+    rng = random.Random(seed)
+
+    board = ttt.initial_state()
+    moves = []
+    while not ttt.terminal(board):
+        name = x_engine if ttt.player(board) == ttt.X else o_engine
+        start = time.perf_counter()
+        action, nodes = ENGINES[name](board, rng, options)
+        latency = (time.perf_counter() - start) * 1000
+        moves.append({"engine": name, "action": list(action),
+                      "nodes": nodes, "latency_ms": latency})
+        board = ttt.result(board, action)
+
+    return {"x": x_engine, "o": o_engine, "seed": seed,
+            "winner": ttt.winner(board), "moves": moves}
+
+
+def percentile(values, fraction):
+    """
+    Returns the value at the given fraction of a sorted list.
+    """
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tic-tac-toe tournament.")
+    parser.add_argument("engines", nargs="*",
+                        help="engines to play: " + ", ".join(ENGINES)
+                        + " (default: minimax random)")
+    parser.add_argument("--games", type=int, default=20,
+                        help="games per pairing")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--board", type=int, nargs=3, default=[3, 3, 3],
+                        metavar=("ROWS", "COLUMNS", "K"))
+    parser.add_argument("--move-time", type=float, default=0.2,
+                        help="seconds per move for searching engines")
+    parser.add_argument("--playouts", type=int, default=500,
+                        help="playouts per move for mcts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write every game as JSONL here")
+    args = parser.parse_args()
+    engines = args.engines or ["minimax", "random"]
+    for name in engines:
+        if name not in ENGINES:
+            parser.error(f"unknown engine {name!r}")
+
+    try:
+        ttt.configure(*args.board)
+    except ValueError as e:
+        parser.error(str(e))
+    options = {"board": args.board, "move_time": args.move_time,
+               "playouts": args.playouts}
+
+    # Each pairing plays half its games with each engine as X
+    rng = random.Random(args.seed)
+    jobs = []
+    for first, second in itertools.combinations_with_replacement(
+            engines, 2):
+        for game in range(args.games):
+            if game % 2 == 0:
+                players = (first, second)
+            else:
+                players = (second, first)
+            jobs.append((*players, rng.getrandbits(32), options))
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with multiprocessing.Pool(args.workers) as pool:
+            games = pool.map(play_game, jobs)
+    else:
+        games = [play_game(job) for job in jobs]
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for game in games:
+                f.write(json.dumps(game) + "\n")
+
+    # Results per pairing, from the first engine's point of view, or from
+    # X's point of view when an engine plays itself
+    print(f"{len(games)} games in {elapsed:.2f}s")
+    print("Results (wins-draws-losses):")
+    for first, second in itertools.combinations_with_replacement(
+            engines, 2):
+        wins = draws = losses = 0
+        for game in games:
+            if {game["x"], game["o"]} != {first, second}:
+                continue
+            if game["winner"] is None:
+                draws += 1
+            elif first == second and game["winner"] == ttt.X:
+                wins += 1
+            elif first != second and game[game["winner"].lower()] == first:
+                wins += 1
+            else:
+                losses += 1
+        label = " (as X)" if first == second else ""
+        print(f"    {first} vs {second}{label}: {wins}-{draws}-{losses}")
+
+    # Search effort and latency per engine
+    print("Moves:")
+    for name in engines:
+        moves = [move for game in games for move in game["moves"]
+                 if move["engine"] == name]
+        nodes = sorted(move["nodes"] for move in moves
+                       if move["nodes"] is not None)
+        hits = len(moves) - len(nodes)
+        latencies = sorted(move["latency_ms"] for move in moves)
+        effort = "no searches"
+        if nodes:
+            effort = (f"nodes p50 {percentile(nodes, 0.5)} "
+                      f"max {percentile(nodes, 1.0)}")
+        print(f"    {name}: {len(moves)} moves, {hits} table hits, "
+              f"{effort}, latency ms p50 {percentile(latencies, 0.5):.2f} "
+              f"p95 {percentile(latencies, 0.95):.2f} "
+              f"p99 {percentile(latencies, 0.99):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import heapq
 import itertools
+import weakref
 
 
 class Sentence():
@@ -127,7 +129,8 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        return set().union(*[conjunct.symbols()
+                             for conjunct in self.conjuncts])
 
 
 class Or(Sentence):
@@ -158,7 +161,8 @@ class Or(Sentence):
                             for disjunct in self.disjuncts])
 
     def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        return set().union(*[disjunct.symbols()
+                             for disjunct in self.disjuncts])
 
 
 class Implication(Sentence):
@@ -225,39 +229,1260 @@ class Biconditional(Sentence):
         return set.union(self.left.symbols(), self.right.symbols())
 
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+class Term():
+    """
+    Immutable node of a logical sentence, interned so that structurally
+    identical subformulas are one and the same object.
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
+    Terms are made with term() or converted from sentences with intern(),
+    never constructed directly. Since equal terms are identical, equality
+    is identity, and the hash and set of symbol names are computed once
+    when the term is made. operator is one of OPERATORS' values.
+    """
 
-        # If model has an assignment for each symbol
-        if not symbols:
+    __slots__ = ("operator", "operands", "name", "hash", "names",
+                 "__weakref__")
 
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
+    def __setattr__(self, attribute, value):
+        raise AttributeError("terms are immutable")
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
+    def __hash__(self):
+        return self.hash
 
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
+    def __repr__(self):
+        if self.operator == "symbol":
+            return self.name
+        operands = ", ".join(str(operand) for operand in self.operands)
+        return f"{self.operator}({operands})"
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
+    def symbols(self):
+        return set(self.names)
 
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+    def evaluate(self, model):
+        values = dict()
+        for node in postorder(self):
+            operands = [values[operand] for operand in node.operands]
+            if node.operator == "symbol":
+                try:
+                    values[node] = bool(model[node.name])
+                except KeyError:
+                    raise Exception(f"variable {node.name} not in model")
+            elif node.operator == "not":
+                values[node] = not operands[0]
+            elif node.operator == "and":
+                values[node] = all(operands)
+            elif node.operator == "or":
+                values[node] = any(operands)
+            elif node.operator == "implies":
+                values[node] = not operands[0] or operands[1]
+            else:
+                values[node] = operands[0] == operands[1]
+        return values[self]
+
+    def formula(self):
+        # Biconditional formulas show their operands' repr, as Sentence does
+        formulas = dict()
+        reprs = dict()
+        for node in postorder(self):
+            operands = [formulas[operand] for operand in node.operands]
+            parts = [Sentence.parenthesize(o) for o in operands]
+            inner = ", ".join(reprs[operand] for operand in node.operands)
+            if node.operator == "symbol":
+                formulas[node] = reprs[node] = node.name
+                continue
+            if node.operator == "not":
+                formulas[node] = "¬" + parts[0]
+            elif node.operator in ("and", "or"):
+                joiner = " ∧ " if node.operator == "and" else " ∨  "
+                if len(operands) == 1:
+                    formulas[node] = operands[0]
+                else:
+                    formulas[node] = joiner.join(parts)
+            elif node.operator == "implies":
+                formulas[node] = f"{parts[0]} => {parts[1]}"
+            else:
+                left, right = [reprs[operand] for operand in node.operands]
+                left = Sentence.parenthesize(left)
+                right = Sentence.parenthesize(right)
+                formulas[node] = f"{left} <=> {right}"
+            cls = CONSTRUCTORS[node.operator]
+            reprs[node] = f"{cls.__name__}({inner})"
+        return formulas[self]
+
+    def sentence(self):
+        """Returns an equivalent tree of Sentence objects."""
+        sentences = dict()
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            missing = [operand for operand in node.operands
+                       if operand not in sentences]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            if node.operator == "symbol":
+                sentences[node] = Symbol(node.name)
+            else:
+                operands = [sentences[operand] for operand in node.operands]
+                sentences[node] = CONSTRUCTORS[node.operator](*operands)
+        return sentences[self]
+
+
+# Operator of each kind of sentence, and the class that builds it back
+OPERATORS = {
+    Symbol: "symbol",
+    Not: "not",
+    And: "and",
+    Or: "or",
+    Implication: "implies",
+    Biconditional: "biconditional"
+}
+CONSTRUCTORS = {
+    operator: cls for cls, operator in OPERATORS.items()
+}
+
+# Unique table of every live term, keyed by its structure. Terms drop
+# out once nothing else refers to them
+TERMS = weakref.WeakValueDictionary()
+
+
+def term(operator, operands=(), name=None):
+    """Returns the unique term with this operator, operands and name."""
+    key = (operator, operands, name)
+    found = TERMS.get(key)
+    if found is None:
+        found = object.__new__(Term)
+        object.__setattr__(found, "operator", operator)
+        object.__setattr__(found, "operands", operands)
+        object.__setattr__(found, "name", name)
+        object.__setattr__(found, "hash", hash(key))
+        if name is not None:
+            names = frozenset([name])
+        elif len(operands) == 1:
+            names = operands[0].names
+        else:
+            names = frozenset().union(*[o.names for o in operands])
+        object.__setattr__(found, "names", names)
+        TERMS[key] = found
+    return found
+
+
+def operands(sentence):
+    """Returns the sentences a sentence is built from."""
+    if isinstance(sentence, Not):
+        return [sentence.operand]
+    if isinstance(sentence, And):
+        return sentence.conjuncts
+    if isinstance(sentence, Or):
+        return sentence.disjuncts
+    if isinstance(sentence, Implication):
+        return [sentence.antecedent, sentence.consequent]
+    if isinstance(sentence, Biconditional):
+        return [sentence.left, sentence.right]
+    return []
+
+
+def intern(sentence):
+    """
+    Returns the term for a sentence. The tree is walked with an explicit
+    stack, so deeply nested sentences do not hit the recursion limit.
+    """
+    if isinstance(sentence, Term):
+        return sentence
+    terms = dict()
+    stack = [sentence]
+    while stack:
+        node = stack[-1]
+        if id(node) in terms:
+            stack.pop()
+            continue
+        missing = [operand for operand in operands(node)
+                   if id(operand) not in terms]
+        if missing:
+            stack.extend(missing)
+            continue
+        stack.pop()
+        if isinstance(node, Symbol):
+            terms[id(node)] = term("symbol", name=node.name)
+        else:
+            operator = next(operator for cls, operator in OPERATORS.items()
+                            if isinstance(node, cls))
+            terms[id(node)] = term(operator, tuple(
+                terms[id(operand)] for operand in operands(node)
+            ))
+    return terms[id(sentence)]
+
+
+def postorder(root):
+    """
+    Returns the distinct subterms of a term, each after its operands,
+    walking with an explicit stack rather than recursion.
+    """
+    order = []
+    seen = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+        elif node not in seen:
+            seen.add(node)
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in node.operands
+                         if operand not in seen)
+    return order
+
+
+# An empty conjunction is true and an empty disjunction is false
+TRUE = term("and")
+FALSE = term("or")
+
+
+def negate(node):
+    if node is TRUE:
+        return FALSE
+    if node is FALSE:
+        return TRUE
+    if node.operator == "not":
+        return node.operands[0]
+    return term("not", (node,))
+
+
+def literal_value(node):
+    """
+    Returns (name, value) if node is a symbol or a negated symbol, with
+    the value that makes it true, or None otherwise.
+    """
+    if node.operator == "symbol":
+        return node.name, True
+    if node.operator == "not" and node.operands[0].operator == "symbol":
+        return node.operands[0].name, False
+    return None
+
+
+def connect(operator, operands):
+    """
+    Returns the "and" or "or" of simplified operands, flattening nested
+    ones of the same kind and dropping constants and duplicates.
+
+    Literals are also propagated: the other operands of an "and" may take
+    its literals as true, and those of an "or" may take them as false, so
+    operands mentioning a literal's symbol are rewritten with it fixed.
+    """
+    identity, absorbing = (TRUE, FALSE) if operator == "and" else (FALSE, TRUE)
+    flat = dict()
+    values = dict()
+    mentions = dict()
+    pending = list(operands)
+    while pending:
+        new = dict()
+        for operand in pending:
+            if operand is absorbing:
+                return absorbing
+            if operand.operator == operator:
+                children = operand.operands
+            else:
+                children = (operand,)
+            for child in children:
+                if child in flat:
+                    continue
+                literal = literal_value(child)
+                if literal is None:
+                    for name in child.names:
+                        mentions.setdefault(name, []).append(child)
+                else:
+                    name, value = literal
+                    if operator == "or":
+                        value = not value
+
+                    # A literal alongside its negation decides the whole
+                    if values.get(name, new.get(name, value)) != value:
+                        return absorbing
+                    new[name] = value
+                flat[child] = None
+
+        # Rewrite the operands that mention the new literals' symbols
+        values.update(new)
+        pending = []
+        for name in new:
+            for operand in mentions.pop(name, []):
+                if operand in flat:
+                    del flat[operand]
+                    pending.append(rewrite(operand, values))
+
+    for operand in flat:
+        if operand.operator == "not" and operand.operands[0] in flat:
+            return absorbing
+    if len(flat) == 1:
+        return next(iter(flat))
+    if not flat:
+        return identity
+    return term(operator, tuple(flat))
+
+
+def equate(left, right):
+    """Returns the biconditional of simplified operands."""
+    if left is right:
+        return TRUE
+    if left is negate(right):
+        return FALSE
+    if left is TRUE or right is TRUE:
+        return right if left is TRUE else left
+    if left is FALSE or right is FALSE:
+        return negate(right if left is FALSE else left)
+    return term("biconditional", (left, right))
+
+
+def rewrite(sentence, values=None):
+    """
+    Returns a simplified term equivalent to sentence, with the symbols
+    in values (a dict of symbol name -> bool) replaced by constants.
+    Implications become disjunctions so they flatten with the rest.
+    """
+    root = intern(sentence)
+    simplified = dict()
+    for node in postorder(root):
+        operands = [simplified[operand] for operand in node.operands]
+        if node.operator == "symbol":
+            if values and node.name in values:
+                result = TRUE if values[node.name] else FALSE
+            else:
+                result = node
+        elif node.operator == "not":
+            result = negate(operands[0])
+        elif node.operator in ("and", "or"):
+            result = connect(node.operator, operands)
+        elif node.operator == "implies":
+            result = connect("or", [negate(operands[0]), operands[1]])
+        else:
+            result = equate(*operands)
+        simplified[node] = result
+    return simplified[root]
+
+
+def simplify(sentence):
+    """
+    Returns a term equivalent to sentence but usually smaller: nested
+    conjunctions and disjunctions are flattened, constants folded,
+    duplicates removed and literals propagated into their siblings.
+    """
+    return rewrite(sentence)
+
+
+def compile_sentence(sentence, names):
+    """
+    Compiles sentence into a Python function of one argument, a sequence
+    of bools giving the value of each of names in order, that returns the
+    truth of sentence in that model.
+
+    The generated function is straight-line code with one statement per
+    distinct subformula, in an order where operands come first, so each
+    shared subformula is evaluated once and nothing recurses.
+    """
+    index = {name: i for i, name in enumerate(names)}
+    root = intern(sentence)
+
+    values = dict()
+    lines = ["def evaluate(model):"]
+    for node in postorder(root):
+        if node.operator == "symbol":
+            values[node] = f"model[{index[node.name]}]"
+            continue
+        operands = [values[operand] for operand in node.operands]
+        if node.operator == "not":
+            expression = f"not {operands[0]}"
+        elif node.operator == "and":
+            expression = " and ".join(operands) or "True"
+        elif node.operator == "or":
+            expression = " or ".join(operands) or "False"
+        elif node.operator == "implies":
+            expression = f"not {operands[0]} or {operands[1]}"
+        else:
+            expression = f"{operands[0]} == {operands[1]}"
+        values[node] = f"v{len(values)}"
+        lines.append(f"    {values[node]} = {expression}")
+    lines.append(f"    return bool({values[root]})")
+
+    namespace = dict()
+    exec("\n".join(lines), namespace)
+    return namespace["evaluate"]
+
+
+def model_check(knowledge, query):
+    """Checks if knowledge base entails query."""
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    knowledge = simplify(knowledge)
+    query = intern(query)
+    symbols = sorted(knowledge.names | query.names)
+
+    # A model where knowledge base is true and query is false disproves it
+    counterexample = compile_sentence(
+        term("and", (knowledge, term("not", (query,)))), symbols
+    )
+
+    # Check that there is no such model
+    models = itertools.product((True, False), repeat=len(symbols))
+    return not any(map(counterexample, models))
+
+
+class CNF():
+    """
+    Conjunctive normal form of sentences by Tseitin encoding.
+
+    Every compound subformula gets a fresh variable, defined by a few
+    clauses, so the clauses grow linearly with the sentence rather than
+    exponentially. Variables are numbered from 1, and a clause is a list
+    of literals: a variable, or its negation as a negative number.
+    """
+
+    def __init__(self):
+        self.variables = dict()
+        self.names = dict()
+        self.definitions = dict()
+        self.clauses = []
+        self.count = 0
+
+    def variable(self, name=None):
+        """Returns a new variable, named after a symbol if given."""
+        self.count += 1
+        if name is not None:
+            self.variables[name] = self.count
+            self.names[self.count] = name
+        return self.count
+
+    def literal(self, sentence):
+        """
+        Returns a literal that is true exactly when sentence is. Operands
+        are encoded before the terms that use them, walking postorder
+        rather than recursing, so deep sentences encode too.
+        """
+        root = intern(sentence)
+        if root in self.definitions:
+            return self.definitions[root]
+        for node in postorder(root):
+            if node in self.definitions:
+                continue
+            literals = [self.definitions[operand]
+                        for operand in node.operands]
+            if node.operator == "symbol":
+                if node.name not in self.variables:
+                    self.variable(node.name)
+                self.definitions[node] = self.variables[node.name]
+                continue
+            if node.operator == "not":
+                self.definitions[node] = -literals[0]
+                continue
+
+            v = self.variable()
+            if node.operator == "and":
+                for literal in literals:
+                    self.clauses.append([-v, literal])
+                self.clauses.append([v] + [-literal for literal in literals])
+            elif node.operator == "or":
+                for literal in literals:
+                    self.clauses.append([v, -literal])
+                self.clauses.append([-v] + literals)
+            elif node.operator == "implies":
+                a, b = literals
+                self.clauses.extend([[-v, -a, b], [v, a], [v, -b]])
+            else:
+                a, b = literals
+                self.clauses.extend([[-v, -a, b], [-v, a, -b],
+                                     [v, a, b], [v, -a, -b]])
+            self.definitions[node] = v
+        return self.definitions[root]
+
+    def add(self, sentence):
+        """Asserts that sentence is true."""
+        stack = [intern(sentence)]
+        while stack:
+            node = stack.pop()
+            if node.operator == "and":
+                stack.extend(reversed(node.operands))
+            elif node.operator == "or":
+                self.clauses.append([self.literal(o) for o in node.operands])
+            elif (node.operator == "not"
+                    and node.operands[0].operator == "and"):
+                self.clauses.append([-self.literal(o)
+                                     for o in node.operands[0].operands])
+            else:
+                self.clauses.append([self.literal(node)])
+
+
+class Solver():
+    """
+    Conflict-driven clause learning SAT solver.
+
+    Clauses are watched by two of their literals, so only clauses that
+    may have become unit are visited when a literal is assigned. Each
+    conflict is analyzed back to its first unique implication point, the
+    resulting clause is learned, and the search jumps back to the level
+    where that clause becomes unit. Decisions favor variables involved in
+    recent conflicts, and the search restarts at growing intervals.
+    """
+
+    # Factor by which variable activities fade after each conflict
+    DECAY = 0.95
+
+    def __init__(self, clauses=()):
+        self.clauses = []
+        self.units = []
+        self.watches = dict()
+        self.activity = dict()
+        self.phases = dict()
+        self.increment = 1.0
+        self.empty = False
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause):
+        """Adds a clause, given as a list of literals."""
+        clause = list(dict.fromkeys(clause))
+        for literal in clause:
+            self.activity.setdefault(abs(literal), 0.0)
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self.empty = True
+        elif len(clause) == 1:
+            self.units.append(clause[0])
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        self.clauses.append(clause)
+        self.watches.setdefault(clause[0], []).append(clause)
+        self.watches.setdefault(clause[1], []).append(clause)
+
+    def value(self, literal):
+        """Returns whether literal is true, or None if unassigned."""
+        value = self.values.get(abs(literal))
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns every literal forced by a unit clause. Returns a clause
+        made false by the assignment, or None if there is no conflict.
+        """
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches.get(false, [])
+            i = 0
+            while i < len(watching):
+                clause = watching[i]
+
+                # Keep the false literal second
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    i += 1
+                    continue
+
+                # Watch another literal that is not false, if any
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(clause)
+                        watching[i] = watching[-1]
+                        watching.pop()
+                        break
+                else:
+                    if self.value(clause[0]) is False:
+                        return clause
+                    self.assign(clause[0], clause)
+                    i += 1
+        return None
+
+    def analyze(self, conflict):
+        """
+        Resolves the conflict clause with the reasons of its literals
+        until one literal of the current level remains. Returns the
+        learned clause, with that literal first, and the level to jump
+        back to.
+        """
+        level = len(self.limits)
+        seen = set()
+        learned = []
+        pending = 0
+        clause = conflict
+        index = len(self.trail)
+        while True:
+            for literal in clause:
+                variable = abs(literal)
+                if variable in seen or self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(literal)
+
+            # Latest assigned literal that took part in the conflict
+            index -= 1
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+
+        # Watch the literal assigned last among the rest, so the clause
+        # is unit right after jumping back
+        learned.sort(key=lambda literal: -self.levels[abs(literal)])
+        learned.insert(0, -literal)
+        if len(learned) == 1:
+            return learned, 0
+        return learned, self.levels[abs(learned[1])]
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            for v in self.activity:
+                self.activity[v] *= 1e-100
+            self.increment *= 1e-100
+            self.order = [(-self.activity[v], v) for v in self.activity
+                          if v not in self.values]
+            heapq.heapify(self.order)
+        elif variable not in self.values:
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+
+    def decide(self):
+        """Returns the most active unassigned variable, or None."""
+        while self.order:
+            activity, variable = heapq.heappop(self.order)
+            if (variable not in self.values
+                    and -activity == self.activity[variable]):
+                return variable
+        return None
+
+    def backtrack(self, level):
+        """Undoes every assignment made above the given level."""
+        if len(self.limits) <= level:
+            return
+        start = self.limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            del self.values[variable]
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.limits[level:]
+        self.head = len(self.trail)
+
+    def reset(self):
+        self.values = dict()
+        self.levels = dict()
+        self.reasons = dict()
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.order = [(-self.activity[v], v) for v in self.activity]
+        heapq.heapify(self.order)
+
+    def solve(self):
+        """
+        Returns a satisfying model as a dict of variable -> bool, or None
+        if the clauses are unsatisfiable. Clauses learned along the way
+        are kept, so clauses may be added and solve called again.
+        """
+        self.reset()
+        if self.empty:
+            return None
+        for literal in self.units:
+            if self.value(literal) is False:
+                return None
+            if self.value(literal) is None:
+                self.assign(literal, None)
+
+        conflicts = 0
+        restart = 100
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.limits:
+                    return None
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.units.append(learned[0])
+                    self.assign(learned[0], None)
+                else:
+                    self.watch(learned)
+                    self.assign(learned[0], learned)
+                self.increment /= Solver.DECAY
+                conflicts += 1
+            elif conflicts >= restart:
+                conflicts = 0
+                restart = int(restart * 1.5)
+                self.backtrack(0)
+            else:
+                variable = self.decide()
+                if variable is None:
+                    return dict(self.values)
+                self.limits.append(len(self.trail))
+                if self.phases.get(variable, False):
+                    self.assign(variable, None)
+                else:
+                    self.assign(-variable, None)
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, by showing that the knowledge
+    base and the negated query cannot both be true.
+    """
+    cnf = CNF()
+    cnf.add(simplify(knowledge))
+    cnf.add(negate(intern(query)))
+    return Solver(cnf.clauses).solve() is None
+
+
+# Truth tables are evaluated a chunk of 2 ** CHUNK_BITS models at a time
+CHUNK_BITS = 20
+
+
+def bit_pattern(i, size):
+    """
+    Returns the 2 ** size bit integer whose bit m is bit i of m:
+    alternating runs of 2 ** i zeros and 2 ** i ones.
+    """
+    if i < 3:
+        block = bytes([(0xAA, 0xCC, 0xF0)[i]])
+    else:
+        run = 1 << (i - 3)
+        block = bytes(run) + b"\xff" * run
+    length = max(1, (1 << size) // 8)
+    pattern = int.from_bytes(block * (length // len(block)), "little")
+    return pattern & ((1 << (1 << size)) - 1)
+
+
+def truth_table_chunks(names):
+    """
+    Yields (columns, ones) for successive chunks of the models of names,
+    where columns maps each name to the bitset of models in the chunk in
+    which it is true, and ones is the bitset of every model in the chunk.
+    Model m gives the i-th name the value of bit i of m. Bitsets are
+    arrays of 64-bit words if NumPy is installed, and Python ints if not.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None and len(names) > 6:
+        ones = np.uint64((1 << 64) - 1)
+        patterns = [bit_pattern(i, 6) for i in range(6)]
+        words = 1 << (len(names) - 6)
+        step = 1 << max(0, CHUNK_BITS - 6)
+        for start in range(0, words, step):
+            index = np.arange(start, min(start + step, words),
+                              dtype=np.uint64)
+            columns = dict()
+            for i, name in enumerate(names):
+                if i < 6:
+                    columns[name] = np.full(len(index), patterns[i],
+                                            dtype=np.uint64)
+                else:
+                    bit = index >> np.uint64(i - 6) & np.uint64(1)
+                    columns[name] = bit * ones
+            yield columns, ones
+    else:
+        size = min(len(names), CHUNK_BITS)
+        ones = (1 << (1 << size)) - 1
+        patterns = [bit_pattern(i, size) for i in range(size)]
+        for chunk in range(1 << (len(names) - size)):
+            columns = dict()
+            for i, name in enumerate(names):
+                if i < size:
+                    columns[name] = patterns[i]
+                else:
+                    columns[name] = ones if chunk >> (i - size) & 1 else 0
+            yield columns, ones
+
+
+def evaluate_bits(root, columns, ones, cache):
+    """
+    Evaluates a term in every model of a chunk at once, given the bitset
+    of each symbol, and returns the bitset where it is true.
+    """
+    for node in postorder(root):
+        if node in cache:
+            continue
+        bits = [cache[operand] for operand in node.operands]
+        if node.operator == "symbol":
+            result = columns[node.name]
+        elif node.operator == "not":
+            result = ones ^ bits[0]
+        elif node.operator == "and":
+            result = ones
+            for operand in bits:
+                result = result & operand
+        elif node.operator == "or":
+            result = ones ^ ones
+            for operand in bits:
+                result = result | operand
+        elif node.operator == "implies":
+            result = (ones ^ bits[0]) | bits[1]
+        else:
+            result = ones ^ (bits[0] ^ bits[1])
+        cache[node] = result
+    return cache[root]
+
+
+def model_check_all(knowledge, queries):
+    """
+    Checks which of the queries knowledge base entails, in one pass over
+    the truth table: every sentence is evaluated in all models of a chunk
+    at once as bitsets. Returns a list of bools, one per query.
+    """
+    knowledge = simplify(knowledge)
+    queries = [intern(query) for query in queries]
+    names = sorted(knowledge.names.union(*[q.names for q in queries]))
+    entailed = [True] * len(queries)
+    for columns, ones in truth_table_chunks(names):
+        cache = dict()
+        models = evaluate_bits(knowledge, columns, ones, cache)
+        for i, query in enumerate(queries):
+            if not entailed[i]:
+                continue
+
+            # Models of the knowledge base where query is false
+            truth = evaluate_bits(query, columns, ones, cache)
+            counterexamples = models & (ones ^ truth)
+            if isinstance(counterexamples, int):
+                entailed[i] = not counterexamples
+            else:
+                entailed[i] = not counterexamples.any()
+        if not any(entailed):
+            break
+    return entailed
+
+
+def truth_table_check(knowledge, query):
+    """Checks if knowledge base entails query, by bitset truth table."""
+    return model_check_all(knowledge, [query])[0]
+
+
+class BDD():
+    """
+    Manager for reduced ordered binary decision diagrams.
+
+    A diagram is an int naming a node: 0 and 1 are the constants false
+    and true, and every other node tests one symbol, continuing to its
+    low child if the symbol is false and its high child if it is true.
+    Symbols are tested in the same order on every path, and the unique
+    table keeps a single node for each (level, low, high), so equivalent
+    sentences compile to the very same node. Results of apply are cached.
+
+    order lists the symbol names to test first. Symbols not in it are
+    tested after them, in the order they are first met.
+    """
+
+    def __init__(self, order=()):
+        self.order = []
+        self.levels = dict()
+        for name in order:
+            self.level(name)
+
+        # Level, low child and high child of each node; the constants
+        # come after every level
+        self.tested = [float("inf"), float("inf")]
+        self.low = [0, 1]
+        self.high = [0, 1]
+
+        self.unique = dict()
+        self.cache = dict()
+        self.compiled = dict()
+
+    def level(self, name):
+        """Returns the position of a symbol in the order, adding it."""
+        if name not in self.levels:
+            self.levels[name] = len(self.order)
+            self.order.append(name)
+        return self.levels[name]
+
+    def make(self, level, low, high):
+        """Returns the node testing level, reusing any identical node."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.tested)
+            self.tested.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def apply(self, operator, u, v):
+        """Returns the node for u and v combined by and, or or xor."""
+        if u > v:
+            u, v = v, u
+        if operator == "and":
+            if u == 0 or u == v:
+                return u
+            if u == 1:
+                return v
+        elif operator == "or":
+            if u == 1 or u == v:
+                return u
+            if u == 0:
+                return v
+        elif u == v:
+            return 0
+        elif u == 0:
+            return v
+
+        key = (operator, u, v)
+        if key in self.cache:
+            return self.cache[key]
+
+        # Split both on the earliest symbol either one tests
+        level = min(self.tested[u], self.tested[v])
+        u_low, u_high = u, u
+        if self.tested[u] == level:
+            u_low, u_high = self.low[u], self.high[u]
+        v_low, v_high = v, v
+        if self.tested[v] == level:
+            v_low, v_high = self.low[v], self.high[v]
+        node = self.make(level, self.apply(operator, u_low, v_low),
+                         self.apply(operator, u_high, v_high))
+        self.cache[key] = node
+        return node
+
+    def negate(self, u):
+        return self.apply("xor", u, 1)
+
+    def compile(self, sentence):
+        """Returns the node for a sentence, reusing compiled subformulas."""
+        root = intern(sentence)
+        for node in postorder(root):
+            if node in self.compiled:
+                continue
+            operands = [self.compiled[operand] for operand in node.operands]
+            if node.operator == "symbol":
+                result = self.make(self.level(node.name), 0, 1)
+            elif node.operator == "not":
+                result = self.negate(operands[0])
+            elif node.operator == "and":
+                result = 1
+                for operand in operands:
+                    result = self.apply("and", result, operand)
+            elif node.operator == "or":
+                result = 0
+                for operand in operands:
+                    result = self.apply("or", result, operand)
+            elif node.operator == "implies":
+                result = self.apply("or", self.negate(operands[0]),
+                                    operands[1])
+            else:
+                result = self.negate(self.apply("xor", *operands))
+            self.compiled[node] = result
+        return self.compiled[root]
+
+    def entails(self, knowledge, query):
+        """Checks if knowledge base entails query."""
+        knowledge = self.compile(knowledge)
+        query = self.compile(query)
+        return self.apply("and", knowledge, self.negate(query)) == 0
+
+    def equivalent(self, a, b):
+        """Checks if two sentences are true in exactly the same models."""
+        return self.compile(a) == self.compile(b)
+
+    def count(self, sentence):
+        """
+        Returns the number of models of sentence, counting assignments to
+        every symbol the manager has seen.
+        """
+        root = self.compile(sentence)
+        total = len(self.order)
+        counts = {0: 0, 1: 1}
+
+        def level(node):
+            return total if node < 2 else self.tested[node]
+
+        # Models over the levels from a node's own level down
+        for node in sorted(self.reachable(root), key=level, reverse=True):
+            low, high = self.low[node], self.high[node]
+            counts[node] = (
+                (counts[low] << (level(low) - level(node) - 1))
+                + (counts[high] << (level(high) - level(node) - 1))
+            )
+        return counts[root] << level(root)
+
+    def reachable(self, root):
+        """Returns the non-constant nodes reachable from root."""
+        seen = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node < 2 or node in seen:
+                continue
+            seen.add(node)
+            stack.append(self.low[node])
+            stack.append(self.high[node])
+        return seen
+
+
+def bdd_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, with decision diagrams. To
+    keep the compiled knowledge base between queries, use
+    KnowledgeBase(knowledge).entails(query, backend="bdd") instead.
+    """
+    return BDD().entails(simplify(knowledge), query)
+
+
+class ResolutionLimit(Exception):
+    pass
+
+
+# Most clauses resolution may generate before giving up
+RESOLUTION_LIMIT = 10_000
+
+
+def resolution_check(knowledge, query, limit=RESOLUTION_LIMIT):
+    """
+    Checks if knowledge base entails query by resolution refutation:
+    clauses are resolved until the empty clause shows that the knowledge
+    base and the negated query cannot both be true.
+
+    Resolution follows the set-of-support strategy, so every resolvent
+    descends from the negated query and clauses of the knowledge base are
+    never resolved with each other. Shorter clauses are resolved first.
+    A new clause is dropped if a kept clause subsumes it, and kept
+    clauses it subsumes are dropped in turn, both found through an index
+    from each literal to the kept clauses containing it.
+
+    Raises ResolutionLimit if more than limit clauses are generated
+    without settling the query.
+    """
+    cnf = CNF()
+    cnf.add(simplify(knowledge))
+    background = list(cnf.clauses)
+    cnf.add(negate(intern(query)))
+    support = cnf.clauses[len(background):]
+
+    # Kept clauses by number, literal -> numbers of the kept clauses that
+    # contain it, and literal -> numbers of the kept clauses filed under
+    # it for subsumption checks, each under just its rarest literal
+    clauses = dict()
+    index = dict()
+    filed = dict()
+    numbers = itertools.count()
+    seen = set()
+
+    def tautology(clause):
+        return any(-literal in clause for literal in clause)
+
+    def subsumed(clause):
+        """Checks if any kept clause is a subset of clause."""
+        for literal in clause:
+            for i in filed.get(literal, ()):
+                if clauses[i] <= clause:
+                    return True
+        return False
+
+    def keep(clause):
+        """Keeps clause, dropping the kept clauses it subsumes."""
+        supersets = set.intersection(*[index.get(literal, set())
+                                       for literal in clause])
+        for i in supersets:
+            for literal in clauses.pop(i):
+                index[literal].discard(i)
+                filed.get(literal, set()).discard(i)
+        number = next(numbers)
+        clauses[number] = clause
+        for literal in clause:
+            index.setdefault(literal, set()).add(number)
+        rarest = min(clause, key=lambda literal: len(filed.get(literal, ())))
+        filed.setdefault(rarest, set()).add(number)
+
+    for clause in sorted(map(frozenset, background), key=len):
+        if not clause:
+            return True
+        if not tautology(clause) and not subsumed(clause):
+            keep(clause)
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    # Clauses waiting to be resolved, shortest first
+    queue = []
+    for clause in map(frozenset, support):
+        if not clause:
+            return True
+        if not tautology(clause) and clause not in seen:
+            seen.add(clause)
+            heapq.heappush(queue, (len(clause), len(seen), clause))
+
+    while queue:
+        _, _, given = heapq.heappop(queue)
+        if subsumed(given):
+            continue
+        negated = frozenset(-literal for literal in given)
+        for literal in given:
+            for i in list(index.get(-literal, ())):
+                # The resolvent is a tautology if the clauses clash on
+                # any literal other than the one resolved on
+                partner = clauses[i]
+                if len(partner & negated) > 1:
+                    continue
+                resolvent = (given - {literal}) | (partner - {-literal})
+                if not resolvent:
+                    return True
+                if resolvent in seen or subsumed(resolvent):
+                    continue
+                seen.add(resolvent)
+                if len(seen) > limit:
+                    raise ResolutionLimit(
+                        f"no refutation within {limit} clauses"
+                    )
+                heapq.heappush(queue, (len(resolvent), len(seen), resolvent))
+        keep(given)
+
+    # The support saturated without a contradiction, which only shows the
+    # query is not entailed if the knowledge base itself is satisfiable
+    return Solver(background).solve() is None
+
+
+# Ways of deciding entailment, by name
+BACKENDS = {
+    "model_check": model_check,
+    "sat": sat_check,
+    "truth_table": truth_table_check,
+    "bdd": bdd_check,
+    "resolution": resolution_check
+}
+
+
+def entails(knowledge, query, backend="sat"):
+    """Checks if knowledge base entails query, using the named backend."""
+    try:
+        check = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown backend {backend}")
+    return check(knowledge, query)
+
+
+class KnowledgeBase():
+    """
+    Answers any number of entailment queries against one knowledge base.
+
+    The knowledge base is evaluated once over the whole truth table of
+    its symbols, as in model_check_all, and the bitsets of its models
+    are kept. A query is then entailed if it is true in all the kept
+    models, which takes one bitset evaluation of the query. When
+    conjuncts are added with And.add, the kept models are narrowed down
+    by them, or found again if they mention symbols not seen before.
+
+    With backend="bdd", the knowledge base is instead compiled once into
+    a decision diagram kept with its manager, so each query only needs
+    its own diagram. Added conjuncts are compiled and joined to it.
+    """
+
+    def __init__(self, knowledge):
+        if not isinstance(knowledge, And):
+            knowledge = And(knowledge)
+        self.knowledge = knowledge
+
+        # Sorted names of the symbols in the truth table, and the bitset
+        # of the knowledge base's models in each chunk of it
+        self.names = []
+        self.models = []
+
+        # Number of conjuncts the kept models account for
+        self.size = None
+
+        # Decision diagram manager, the knowledge base's node in it and
+        # the number of conjuncts that node accounts for
+        self.bdd = None
+        self.diagram = None
+        self.compiled = None
+
+    def add(self, sentence):
+        self.knowledge.add(sentence)
+
+    def refresh(self):
+        """Brings the kept models up to date with the knowledge base."""
+        conjuncts = self.knowledge.conjuncts
+        if self.size is not None and self.size <= len(conjuncts):
+            added = simplify(And(*conjuncts[self.size:]))
+            if added.names <= set(self.names):
+                self.models = [
+                    models & evaluate_bits(added, columns, ones, dict())
+                    for models, (columns, ones) in zip(
+                        self.models, truth_table_chunks(self.names)
+                    )
+                ]
+                self.size = len(conjuncts)
+                return
+        self.size = len(conjuncts)
+        self.tabulate()
+
+    def tabulate(self):
+        """Finds every model of the knowledge base."""
+        knowledge = simplify(self.knowledge)
+        self.names = sorted(knowledge.names)
+        self.models = [
+            evaluate_bits(knowledge, columns, ones, dict())
+            for columns, ones in truth_table_chunks(self.names)
+        ]
+
+    def compile(self):
+        """Brings the knowledge base's decision diagram up to date."""
+        conjuncts = self.knowledge.conjuncts
+        if self.compiled is None or self.compiled > len(conjuncts):
+            self.bdd = BDD()
+            self.diagram = 1
+            self.compiled = 0
+        for conjunct in conjuncts[self.compiled:]:
+            self.diagram = self.bdd.apply(
+                "and", self.diagram, self.bdd.compile(simplify(conjunct))
+            )
+        self.compiled = len(conjuncts)
+
+    def entails(self, query, backend="models"):
+        """
+        Checks if the knowledge base entails query, with the kept models
+        or, if backend is "bdd", with the kept decision diagram.
+        """
+        if backend == "bdd":
+            self.compile()
+            query = self.bdd.compile(query)
+            return self.bdd.apply(
+                "and", self.diagram, self.bdd.negate(query)
+            ) == 0
+        if backend != "models":
+            raise ValueError(f"unknown backend {backend}")
+        self.refresh()
+
+        # Symbols the kept models do not cover may take any value, so the
+        # table would need extending; check such a query on its own
+        query = intern(query)
+        if not query.names <= set(self.names):
+            return truth_table_check(self.knowledge, query)
+
+        for models, (columns, ones) in zip(
+                self.models, truth_table_chunks(self.names)):
+            truth = evaluate_bits(query, columns, ones, dict())
+            counterexamples = models & (ones ^ truth)
+            if isinstance(counterexamples, int):
+                if counterexamples:
+                    return False
+            elif counterexamples.any():
+                return False
+        return True
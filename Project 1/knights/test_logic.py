@@ -0,0 +1,81 @@
+import random
+import time
+import unittest
+
+from logic import *
+
+
+def random_knowledge(count, clauses, seed=0):
+    """
+    Returns count symbols and a knowledge base of random three-literal
+    clauses over them.
+    """
+    rng = random.Random(seed)
+    symbols = [Symbol(f"S{i}") for i in range(count)]
+
+    def literal():
+        symbol = rng.choice(symbols)
+        return symbol if rng.random() < 0.5 else Not(symbol)
+
+    knowledge = And(*[Or(literal(), literal(), literal())
+                      for _ in range(clauses)])
+    return symbols, knowledge, literal
+
+
+class BackendTest(unittest.TestCase):
+
+    def test_term_queries(self):
+        A, B = Symbol("A"), Symbol("B")
+        knowledge = And(A, Implication(A, B))
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                self.assertTrue(
+                    entails(knowledge, intern(And(A, B)), backend=backend)
+                )
+                self.assertFalse(
+                    entails(knowledge, negate(intern(B)), backend=backend)
+                )
+
+
+class DeepFormulaTest(unittest.TestCase):
+
+    def test_sat_check(self):
+        A, B, C = Symbol("A"), Symbol("B"), Symbol("C")
+        query = A
+        for i in range(3000):
+            query = Biconditional(query, B) if i % 2 else Or(query, C)
+        knowledge = And(A, B, Not(C))
+        self.assertTrue(entails(knowledge, query, backend="sat"))
+        self.assertTrue(KnowledgeBase(knowledge).entails(query))
+
+
+class KnowledgeBaseTest(unittest.TestCase):
+
+    def test_faster_than_separate_model_checks(self):
+        symbols, knowledge, literal = random_knowledge(16, 40)
+        queries = [Or(literal(), literal()) for _ in range(6)]
+
+        start = time.perf_counter()
+        expected = [model_check(knowledge, query) for query in queries]
+        separate = time.perf_counter() - start
+
+        start = time.perf_counter()
+        base = KnowledgeBase(knowledge)
+        answers = [base.entails(query) for query in queries]
+        batched = time.perf_counter() - start
+
+        self.assertEqual(answers, expected)
+        self.assertLess(batched, separate)
+
+    def test_added_conjuncts(self):
+        A, B = Symbol("A"), Symbol("B")
+        knowledge = And(Or(A, B))
+        base = KnowledgeBase(knowledge)
+        self.assertFalse(base.entails(A))
+        knowledge.add(Not(B))
+        self.assertTrue(base.entails(A))
+        self.assertTrue(base.entails(Or(A, Symbol("C"))))
+
+
+if __name__ == "__main__":
+    unittest.main()